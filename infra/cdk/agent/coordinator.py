@@ -10,19 +10,48 @@ Strands SDK を使用したマルチモーダルオーケストレーター。
 - 12-Factor App Agents 準拠
 """
 import os
+import re
+import json
+import asyncio
+import hashlib
 import logging
-from typing import Optional, Any
+import itertools
+from typing import Optional, Any, AsyncIterator
 from datetime import datetime
 
-import boto3
+import orjson
 
 from .memory.dynamodb_memory import DynamoDBSessionMemory, DynamoDBLongTermMemory
 from .tools.audio import transcribe_audio, analyze_audio
 from .tools.video import analyze_video
 from .tools.search import search_knowledge, generate_embeddings
+from src.infrastructure.gateways.clients import get_aio_client
 
 logger = logging.getLogger(__name__)
 
+# ツール選択キーワード (辞書順 = tool_calls の順序)
+_TOOL_KEYWORDS = {
+    'transcribe_audio': ['音声', 'audio', '文字起こし', 'transcribe'],
+    'analyze_video': ['映像', 'video', '動画', '分析'],
+    'search_knowledge': ['検索', 'search', '探', 'find'],
+    'generate_embeddings': ['埋め込み', 'embedding', 'ベクトル'],
+}
+_TOOL_ORDER = {tool: i for i, tool in enumerate(_TOOL_KEYWORDS)}
+_KEYWORD_TO_TOOL = {
+    word: tool for tool, words in _TOOL_KEYWORDS.items() for word in words
+}
+
+# 全キーワードを1つの正規表現に事前コンパイル (入力を1パスで走査)
+# IGNORECASE により入力全体の小文字コピーを作らない
+_KEYWORD_PATTERN = re.compile(
+    '|'.join(re.escape(w) for w in sorted(_KEYWORD_TO_TOOL, key=len, reverse=True)),
+    re.IGNORECASE,
+)
+
+# ストリーミング応答のうちテキスト差分イベントの識別子
+# (message_start / content_block_stop 等はパースせずに読み飛ばす)
+_TEXT_DELTA_MARKER = b'"content_block_delta"'
+
 
 class NovaCoordinatorAgent:
     """
@@ -45,6 +74,11 @@ class NovaCoordinatorAgent:
         event_store_table: str = None,
         model_id: str = 'anthropic.claude-3-5-sonnet-20240620-v1:0',
         guardrail_id: Optional[str] = None,
+        guardrail_version: str = 'DRAFT',
+        guardrail_region: Optional[str] = None,
+        cache_enabled: bool = False,
+        cache_ttl_minutes: int = 30,
+        regions: Optional[list[str]] = None,
     ):
         """
         Args:
@@ -52,9 +86,23 @@ class NovaCoordinatorAgent:
             event_store_table: DynamoDB Event Store table name (long-term memory)
             model_id: Bedrock model ID for reasoning
             guardrail_id: Bedrock Guardrails ID (optional)
+            guardrail_version: Bedrock Guardrails version
+            guardrail_region: Guardrail を作成したリージョン (None の場合はデフォルトリージョン)
+            cache_enabled: 完全一致の応答キャッシュを有効にするか
+            cache_ttl_minutes: 応答キャッシュの有効期間 (分)
+            regions: Bedrock 呼び出しを分散するリージョン (None の場合はデフォルトリージョン)
         """
         self.model_id = model_id
         self.guardrail_id = guardrail_id
+        self.guardrail_version = guardrail_version
+        # Guardrail はリージョン単位のリソースのため、ラウンドロビン対象外の固定リージョンで呼び出す
+        self.guardrail_region = guardrail_region
+        self.cache_enabled = cache_enabled
+        self.cache_ttl_minutes = cache_ttl_minutes
+        
+        # リージョン単位の TPS クォータを回避するためラウンドロビンで分散
+        self.regions = regions or [None]
+        self._region_cycle = itertools.cycle(self.regions)
         
         # Memory Management (Factor 5)
         self.session_memory = DynamoDBSessionMemory(
@@ -65,9 +113,6 @@ class NovaCoordinatorAgent:
             table_name=event_store_table or os.environ.get('EVENT_STORE_TABLE', 'nova-event-store'),
         )
         
-        # Bedrock Runtime Client
-        self.bedrock = boto3.client('bedrock-runtime')
-        
         # Tool Registry (Factor 6)
         self.tools = {
             'transcribe_audio': transcribe_audio,
@@ -89,6 +134,18 @@ class NovaCoordinatorAgent:
 
 ユーザーの意図を理解し、最適なツールを組み合わせて処理してください。
 複数のツールを連携させる場合は、順序と理由を説明してください。"""
+        
+        # リクエストボディの不変部分を事前シリアライズ (呼び出し毎は messages のみ)
+        static_body = json.dumps({
+            'anthropic_version': 'bedrock-2023-05-31',
+            'max_tokens': 4096,
+            'system': [{
+                'type': 'text',
+                'text': self.system_prompt,
+                'cache_control': {'type': 'ephemeral'},
+            }],
+        }, ensure_ascii=False)
+        self._body_prefix = static_body[:-1] + ', "messages": '
 
     async def process(
         self,
@@ -108,44 +165,134 @@ class NovaCoordinatorAgent:
             dict: {"response": str, "tool_calls": list, "session_id": str}
         """
         logger.info(f"Processing request for session: {session_id}")
+        received_at = datetime.utcnow().isoformat()
+        
+        # 1-3. 履歴・関連情報の取得とツール選択
+        messages, tool_calls = await self._prepare_turn(user_input, session_id, user_id)
+        
+        # 4. Bedrock で最終応答を生成
+        response = await self._generate_response(messages)
+        
+        # 5-6. Session Memory 更新と Event Store 保存 (Long-term Memory)
+        await self._complete_turn(session_id, user_input, received_at, response, tool_calls)
+        
+        return {
+            'response': response,
+            'tool_calls': tool_calls,
+            'session_id': session_id,
+        }
+
+    async def process_stream(
+        self,
+        user_input: str,
+        session_id: str,
+        user_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        ストリーミング処理 - 応答テキストを生成され次第 yield
+        
+        process() と同じオーケストレーションを行い、Bedrock の
+        invoke_model_with_response_stream のテキスト delta を逐次返す。
+        メモリへの保存は応答の完了後に行う。
         
-        # 1. Session Memory から過去の会話を取得
-        history = await self.session_memory.get_history(session_id)
+        Args:
+            user_input: ユーザーからの入力
+            session_id: セッションID
+            user_id: ユーザーID (optional)
+            
+        Yields:
+            str: 応答テキストの delta
+        """
+        logger.info(f"Processing streaming request for session: {session_id}")
+        received_at = datetime.utcnow().isoformat()
         
-        # 2. Long-term Memory から関連情報を取得 (optional)
-        context = await self._get_relevant_context(user_input, user_id)
+        messages, tool_calls = await self._prepare_turn(user_input, session_id, user_id)
+        
+        parts = []
+        async for delta in self._stream_response(messages):
+            parts.append(delta)
+            yield delta
+        
+        await self._complete_turn(session_id, user_input, received_at, ''.join(parts), tool_calls)
+
+    async def _prepare_turn(
+        self,
+        user_input: str,
+        session_id: str,
+        user_id: Optional[str],
+    ) -> tuple[list, list]:
+        """
+        履歴・関連情報の取得とツール選択を行い、Bedrock 用メッセージを構築
+        
+        Returns:
+            tuple: (messages, tool_calls)
+        """
+        # 1-2. Session Memory (過去の会話) と Long-term Memory (関連情報) を並列取得
+        history, context = await asyncio.gather(
+            self.session_memory.get_history(session_id),
+            self._get_relevant_context(user_input, user_id),
+        )
         
         # 3. ツール選択と実行 (Agent が自動判断)
         tool_calls, tool_results = await self._execute_tools(user_input, history)
         
-        # 4. Bedrock で最終応答を生成
-        response = await self._generate_response(
+        messages = self._build_messages(
             user_input=user_input,
             history=history,
             context=context,
             tool_results=tool_results,
         )
+        return messages, tool_calls
+
+    async def _complete_turn(
+        self,
+        session_id: str,
+        user_input: str,
+        received_at: str,
+        response: str,
+        tool_calls: list,
+    ) -> None:
+        """Session Memory 更新と Event Store 保存を1トランザクションで実行"""
+        await self._flush_turn(
+            session_id=session_id,
+            messages=[
+                ('user', user_input, received_at),
+                ('assistant', response, datetime.utcnow().isoformat()),
+            ],
+            event_data={
+                'user_input': user_input,
+                'response': response,
+                'tool_calls': tool_calls,
+            },
+        )
+
+    async def _flush_turn(
+        self,
+        session_id: str,
+        messages: list[tuple[str, str, str]],
+        event_data: dict,
+    ) -> None:
+        """
+        ターン終了時の書き込みを TransactWriteItems 1回で実行
         
-        # 5. Session Memory を更新
-        await self.session_memory.add_message(session_id, 'user', user_input)
-        await self.session_memory.add_message(session_id, 'assistant', response)
+        メッセージ (Session Memory) とイベント (Event Store) はテーブルを跨ぐが、
+        DynamoDB トランザクションは同一リージョン内の複数テーブルに対応する。
+        Resource 由来のクライアントを使うため Python 型のまま渡せる。
+        """
+        transact_items = self.session_memory.build_turn_writes(session_id, messages)
         
-        # 6. イベントを Event Store に保存 (Long-term Memory)
-        await self.long_term_memory.store_event(
+        _, event_item = self.long_term_memory.build_event_item(
             aggregate_id=session_id,
             event_type='ConversationTurn',
-            data={
-                'user_input': user_input,
-                'response': response,
-                'tool_calls': tool_calls,
-            }
+            data=event_data,
         )
+        transact_items.append({'Put': {
+            'TableName': self.long_term_memory.table_name,
+            'Item': event_item,
+        }})
         
-        return {
-            'response': response,
-            'tool_calls': tool_calls,
-            'session_id': session_id,
-        }
+        client = self.session_memory.table.meta.client
+        await asyncio.to_thread(client.transact_write_items, TransactItems=transact_items)
 
     async def _execute_tools(
         self,
@@ -157,26 +304,21 @@ class NovaCoordinatorAgent:
         
         Agent がユーザー入力と履歴を分析し、適切なツールを選択・実行。
         """
-        tool_calls = []
         tool_results = []
         
         # 入力を分析してツール選択 (簡易実装)
         # 実際の Strands SDK では Agent が自動判断
+        # Note: 実際の実行は Lambda Handler で行う
         
-        input_lower = user_input.lower()
-        
-        if any(word in input_lower for word in ['音声', 'audio', '文字起こし', 'transcribe']):
-            tool_calls.append('transcribe_audio')
-            # Note: 実際の実行は Lambda Handler で行う
-            
-        if any(word in input_lower for word in ['映像', 'video', '動画', '分析']):
-            tool_calls.append('analyze_video')
-            
-        if any(word in input_lower for word in ['検索', 'search', '探', 'find']):
-            tool_calls.append('search_knowledge')
-            
-        if any(word in input_lower for word in ['埋め込み', 'embedding', 'ベクトル']):
-            tool_calls.append('generate_embeddings')
+        matched = set()
+        for m in _KEYWORD_PATTERN.finditer(user_input):
+            tool = _KEYWORD_TO_TOOL.get(m.group(0).lower())
+            if tool is None:
+                continue  # Unicode 大文字小文字同一視の特殊ケース (例: 'ſ')
+            matched.add(tool)
+            if len(matched) == len(_TOOL_ORDER):
+                break  # 全ツール選択済み
+        tool_calls = sorted(matched, key=_TOOL_ORDER.__getitem__)
         
         return tool_calls, tool_results
 
@@ -189,35 +331,28 @@ class NovaCoordinatorAgent:
         if not user_id:
             return ""
         
-        # 過去のイベントから関連情報を取得
+        # 過去の会話イベントから関連情報を取得 (タイプは Query 側で絞り込み)
         events = await self.long_term_memory.get_recent_events(
             user_id=user_id,
             limit=5,
+            event_type_filter='ConversationTurn',
         )
         
         if not events:
             return ""
         
-        context_parts = []
-        for event in events:
-            if event.get('event_type') == 'ConversationTurn':
-                context_parts.append(f"- {event.get('data', {}).get('user_input', '')}")
-        
-        if context_parts:
-            return f"過去の関連会話:\n" + "\n".join(context_parts)
-        
-        return ""
+        return "過去の関連会話:\n" + "\n".join(
+            f"- {event['data'].get('user_input', '')}" for event in events
+        )
 
-    async def _generate_response(
+    def _build_messages(
         self,
         user_input: str,
         history: list,
         context: str,
         tool_results: list,
-    ) -> str:
-        """Bedrock で最終応答を生成"""
-        import json
-        
+    ) -> list:
+        """Bedrock に送るメッセージ列を構築"""
         # メッセージ履歴を構築
         messages = []
         for msg in history[-10:]:  # 最新10件
@@ -226,6 +361,14 @@ class NovaCoordinatorAgent:
                 'content': msg['content'],
             })
         
+        # Prompt Caching: 履歴の末尾までを安定プレフィックスとしてキャッシュ
+        if messages:
+            messages[-1]['content'] = [{
+                'type': 'text',
+                'text': messages[-1]['content'],
+                'cache_control': {'type': 'ephemeral'},
+            }]
+        
         # 現在のユーザー入力を追加
         current_content = user_input
         if context:
@@ -234,27 +377,118 @@ class NovaCoordinatorAgent:
             current_content += f"\n\nツール実行結果:\n{json.dumps(tool_results, ensure_ascii=False)}"
         
         messages.append({'role': 'user', 'content': current_content})
+        return messages
+
+    async def _generate_response(self, messages: list) -> str:
+        """Bedrock で最終応答を生成 (ストリームの delta を連結)"""
+        parts = []
+        async for delta in self._stream_response(messages):
+            parts.append(delta)
+        return ''.join(parts)
+
+    async def _stream_response(self, messages: list) -> AsyncIterator[str]:
+        """Bedrock のストリーミング応答からテキスト delta を yield"""
+        body = self._build_request_body(messages)
+        
+        # Guardrails の入力チェック (Factor 7)
+        # キャッシュ応答・モデル呼び出しより先に実行し、ブロック時は Bedrock を呼び出さない
+        if self.guardrail_id:
+            try:
+                guardrail_client = await get_aio_client('bedrock-runtime', self.guardrail_region)
+                blocked_message = await self._check_guardrail(
+                    guardrail_client, messages[-1]['content'],
+                )
+            except Exception as e:
+                logger.exception("Guardrail check failed")
+                yield f"申し訳ありません。処理中にエラーが発生しました: {str(e)}"
+                return
+            if blocked_message is not None:
+                logger.info("Input blocked by guardrail")
+                yield blocked_message
+                return
+        
+        # 応答キャッシュ (完全一致)
+        cache_key = None
+        if self.cache_enabled:
+            cache_key = self._response_cache_key(body)
+            cached = await self.session_memory.get_cached_response(cache_key)
+            if cached is not None:
+                logger.info("Response cache hit")
+                yield cached
+                return
         
         # Bedrock 呼び出し
+        parts = []
         try:
-            response = self.bedrock.invoke_model(
+            client = await get_aio_client('bedrock-runtime', next(self._region_cycle))
+            response = await client.invoke_model_with_response_stream(
                 modelId=self.model_id,
                 contentType='application/json',
                 accept='application/json',
-                body=json.dumps({
-                    'anthropic_version': 'bedrock-2023-05-31',
-                    'max_tokens': 4096,
-                    'messages': messages,
-                    'system': self.system_prompt,
-                }),
+                body=body,
             )
             
-            result = json.loads(response['body'].read())
-            return result['content'][0]['text']
+            async for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                data = chunk['bytes']
+                if _TEXT_DELTA_MARKER not in data:
+                    continue
+                payload = orjson.loads(data)
+                if payload.get('type') == 'content_block_delta':
+                    text = payload.get('delta', {}).get('text')
+                    if text:
+                        parts.append(text)
+                        yield text
             
         except Exception as e:
             logger.exception("Bedrock invocation failed")
-            return f"申し訳ありません。処理中にエラーが発生しました: {str(e)}"
+            yield f"申し訳ありません。処理中にエラーが発生しました: {str(e)}"
+            return
+        
+        if cache_key:
+            try:
+                await self.session_memory.put_cached_response(
+                    cache_key, ''.join(parts), ttl_seconds=self.cache_ttl_minutes * 60,
+                )
+            except Exception as e:
+                logger.warning(f"Failed to store response cache: {e}")
+
+    async def _check_guardrail(self, client: Any, text: str) -> Optional[str]:
+        """
+        Bedrock Guardrails で入力を検証 (Factor 7)
+        
+        Returns:
+            Optional[str]: ブロックされた場合はその応答メッセージ、通過時は None
+        """
+        result = await client.apply_guardrail(
+            guardrailIdentifier=self.guardrail_id,
+            guardrailVersion=self.guardrail_version,
+            source='INPUT',
+            content=[{'text': {'text': text}}],
+        )
+        if result.get('action') != 'GUARDRAIL_INTERVENED':
+            return None
+        
+        outputs = result.get('outputs') or [{}]
+        return outputs[0].get('text', '申し訳ありません。このリクエストにはお応えできません。')
+
+    def _build_request_body(self, messages: list) -> bytes:
+        """事前シリアライズ済みの不変部分に messages を連結してボディを構築"""
+        return (self._body_prefix + json.dumps(messages, ensure_ascii=False) + '}').encode('utf-8')
+
+    def _response_cache_key(self, body: bytes) -> str:
+        """
+        モデルIDとリクエストボディ (システムプロンプト・メッセージを含む) から応答キャッシュキーを生成
+        
+        暗号学的強度は不要なため、SHA-256 より高速な BLAKE2b (128bit) を使用。
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model_id.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(body)
+        return digest.hexdigest()
 
     async def create_session(self, user_id: Optional[str] = None) -> str:
         """新しいセッションを作成"""
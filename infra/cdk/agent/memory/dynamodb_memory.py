@@ -5,22 +5,91 @@ Redis代替として DynamoDB TTL を使用:
 - Session Memory: TTL付き (デフォルト24時間)
 - Long-term Memory: Event Store (永続)
 
+boto3 は同期 API のため、各呼び出しは asyncio.to_thread でスレッドに逃がし
+イベントループをブロックしない (asyncio.gather で並列化可能)。
+
 コスト効率:
 - ElastiCache Redis (~$12/月) → DynamoDB On-Demand (~$1/月以下 for low traffic)
 """
 import os
 import json
+import time
+import secrets
+import threading
+import asyncio
 import uuid
 import logging
-from datetime import datetime, timedelta
-from typing import Optional
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from boto3.dynamodb.conditions import Attr, Key
 
-import boto3
-from boto3.dynamodb.conditions import Key
+from src.infrastructure.gateways.clients import get_resource
 
 logger = logging.getLogger(__name__)
 
 
+_CROCKFORD32 = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+_ulid_lock = threading.Lock()
+_ulid_last = (0, 0)
+
+
+def new_ulid() -> str:
+    """
+    単調増加の ULID (26文字) を生成
+    
+    48bit ミリ秒タイムスタンプ + 80bit 乱数。同一ミリ秒内では乱数部を
+    インクリメントし、辞書順 = 生成順を保証する (ソートキー用)。
+    """
+    global _ulid_last
+    with _ulid_lock:
+        ts = time.time_ns() // 1_000_000
+        last_ts, last_rand = _ulid_last
+        if ts <= last_ts:
+            ts, rand = last_ts, last_rand + 1
+        else:
+            rand = secrets.randbits(80)
+        _ulid_last = (ts, rand)
+    
+    value = (ts << 80) | rand
+    return ''.join(_CROCKFORD32[(value >> shift) & 0x1F] for shift in range(125, -1, -5))
+
+
+# 履歴の差分 Query で使う SK の上限 (ULID の Crockford Base32 文字はすべて '~' より小さい)
+# META (sk='META') は 'MESSAGE#' より辞書順で後ろのため、begins_with を使わない範囲指定で除外する
+_MESSAGE_SK_PREFIX = 'MESSAGE#'
+_MESSAGE_SK_MAX = 'MESSAGE#~'
+
+
+def _to_attribute_value(value: Any) -> Any:
+    """float を Decimal に変換 (DynamoDB Map としてそのまま保存するため)"""
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _to_attribute_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_attribute_value(v) for v in value]
+    return value
+
+
+def _history_entry(item: dict) -> dict:
+    """メッセージアイテムを get_history の戻り値形式に変換"""
+    return {
+        'role': item['role'],
+        'content': item['content'],
+        'timestamp': item.get('timestamp'),
+    }
+
+
+def _load_event_data(data: Any) -> dict:
+    """イベント data を取得 (移行期間中は旧形式の JSON 文字列にも対応)"""
+    if isinstance(data, str):
+        return json.loads(data)
+    return data or {}
+
+
 class DynamoDBSessionMemory:
     """
     短期セッションメモリ (Redis代替)
@@ -32,27 +101,59 @@ class DynamoDBSessionMemory:
     
     単一テーブル設計:
     - PK: SESSION#{session_id}
-    - SK: MESSAGE#{timestamp} or META
+    - SK: MESSAGE#{ulid} or META (ULID は時刻順に辞書ソート可能)
+    - PK: CACHE#{cache_key}, SK: RESP (応答キャッシュ)
+    
+    メッセージは各行が自身の TTL を持つため、META の updated_at / ttl は
+    meta_update_interval 件ごとにのみ更新する (粗い鮮度)。
+    
+    ホットセッションの履歴はプロセス内 LRU にキャッシュし、最後に読んだ
+    MESSAGE# の SK 以降だけを Query して別インスタンスの書き込みを取り込む。
     """
     
     def __init__(
         self,
         table_name: str = None,
         ttl_hours: int = 24,
+        meta_update_interval: int = 10,
+        history_cache_size: int = 256,
+        message_count_cache_size: int = 4096,
     ):
         """
         Args:
             table_name: DynamoDB table name
             ttl_hours: Session TTL in hours
+            meta_update_interval: META を更新するメッセージ間隔
+            history_cache_size: 履歴をキャッシュするセッション数 (0 で無効)
+            message_count_cache_size: META 更新の間引き用に件数を保持するセッション数
         """
         self.table_name = table_name or os.environ.get('SESSION_TABLE', 'nova-session-memory')
         self.ttl_hours = ttl_hours
-        self.dynamodb = boto3.resource('dynamodb')
+        self._ttl_seconds = ttl_hours * 3600
+        self.meta_update_interval = max(1, meta_update_interval)
+        # session_id -> このプロセスで書き込んだメッセージ数 (LRU で上限を設ける)
+        # 追い出されたセッションは次のメッセージで META を更新するだけなので安全
+        self.message_count_cache_size = max(1, message_count_cache_size)
+        self._message_counts: OrderedDict[str, int] = OrderedDict()
+        self.dynamodb = get_resource('dynamodb')
         self.table = self.dynamodb.Table(self.table_name)
         
-    def _get_ttl(self) -> int:
-        """TTL timestamp を計算"""
-        return int((datetime.utcnow() + timedelta(hours=self.ttl_hours)).timestamp())
+        # session_id -> (last_sk, complete, messages)
+        self.history_cache_size = history_cache_size
+        self._history_cache: OrderedDict[str, tuple[Optional[str], bool, list]] = OrderedDict()
+        
+    def _get_ttl(self, now_ts: Optional[float] = None) -> int:
+        """TTL timestamp を計算 (epoch 秒の整数演算のみ)"""
+        return int(time.time() if now_ts is None else now_ts) + self._ttl_seconds
+    
+    def _should_update_meta(self, session_id: str) -> bool:
+        """このプロセスでの最初のメッセージ、以降 meta_update_interval 件ごとに True"""
+        count = self._message_counts.get(session_id, 0)
+        self._message_counts[session_id] = count + 1
+        self._message_counts.move_to_end(session_id)
+        if len(self._message_counts) > self.message_count_cache_size:
+            self._message_counts.popitem(last=False)
+        return count % self.meta_update_interval == 0
     
     async def create_session(self, user_id: Optional[str] = None) -> str:
         """
@@ -64,7 +165,8 @@ class DynamoDBSessionMemory:
         session_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat()
         
-        self.table.put_item(
+        await asyncio.to_thread(
+            self.table.put_item,
             Item={
                 'pk': f'SESSION#{session_id}',
                 'sk': 'META',
@@ -73,7 +175,7 @@ class DynamoDBSessionMemory:
                 'created_at': now,
                 'updated_at': now,
                 'ttl': self._get_ttl(),
-            }
+            },
         )
         
         logger.info(f"Created session: {session_id}")
@@ -81,36 +183,46 @@ class DynamoDBSessionMemory:
     
     async def get_session(self, session_id: str) -> Optional[dict]:
         """セッションメタデータを取得"""
-        response = self.table.get_item(
+        response = await asyncio.to_thread(
+            self.table.get_item,
             Key={
                 'pk': f'SESSION#{session_id}',
                 'sk': 'META',
-            }
+            },
         )
         return response.get('Item')
     
     async def delete_session(self, session_id: str) -> None:
         """セッションを削除"""
-        # メタデータ削除
-        self.table.delete_item(
-            Key={
-                'pk': f'SESSION#{session_id}',
-                'sk': 'META',
-            }
-        )
+        self._history_cache.pop(session_id, None)
+        self._message_counts.pop(session_id, None)
+        await asyncio.to_thread(self._delete_session, session_id)
+        logger.info(f"Deleted session: {session_id}")
+    
+    def _delete_session(self, session_id: str) -> None:
+        """
+        セッション削除 (同期処理)
         
-        # メッセージも削除 (scan + delete)
-        response = self.table.query(
-            KeyConditionExpression=Key('pk').eq(f'SESSION#{session_id}')
-        )
+        META を含むパーティション全体を LastEvaluatedKey でページングしながら
+        キーのみ射影して取得し、単一の batch_writer で削除する。
+        """
+        query_kwargs = {
+            'KeyConditionExpression': Key('pk').eq(f'SESSION#{session_id}'),
+            'ProjectionExpression': 'pk, sk',
+        }
         
         with self.table.batch_writer() as batch:
-            for item in response.get('Items', []):
-                batch.delete_item(
-                    Key={'pk': item['pk'], 'sk': item['sk']}
-                )
-        
-        logger.info(f"Deleted session: {session_id}")
+            while True:
+                response = self.table.query(**query_kwargs)
+                for item in response.get('Items', []):
+                    batch.delete_item(
+                        Key={'pk': item['pk'], 'sk': item['sk']}
+                    )
+                
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_kwargs['ExclusiveStartKey'] = last_key
     
     async def add_message(
         self,
@@ -126,33 +238,93 @@ class DynamoDBSessionMemory:
             role: 'user' or 'assistant'
             content: メッセージ内容
         """
-        now = datetime.utcnow()
-        timestamp = now.isoformat()
+        now_ts = time.time()
+        timestamp = datetime.utcfromtimestamp(now_ts).isoformat()
+        ttl = self._get_ttl(now_ts)
         
-        self.table.put_item(
-            Item={
-                'pk': f'SESSION#{session_id}',
-                'sk': f'MESSAGE#{timestamp}',
-                'role': role,
-                'content': content,
-                'timestamp': timestamp,
-                'ttl': self._get_ttl(),
-            }
+        await asyncio.to_thread(
+            self.table.put_item,
+            Item=self.build_message_item(session_id, role, content, timestamp, ttl),
         )
         
-        # メタデータの updated_at を更新
-        self.table.update_item(
-            Key={
+        # メタデータの updated_at を更新 (間引き)
+        if not self._should_update_meta(session_id):
+            return
+        
+        await asyncio.to_thread(
+            self.table.update_item,
+            **self.build_meta_update(session_id, timestamp, ttl),
+        )
+    
+    def build_message_item(
+        self,
+        session_id: str,
+        role: str,
+        content: str,
+        timestamp: str,
+        ttl: int,
+    ) -> dict:
+        """
+        メッセージアイテムを構築 (TransactWriteItems からも利用)
+        
+        SK は呼び出し順に単調増加する ULID。timestamp は表示用の属性として保持。
+        """
+        return {
+            'pk': f'SESSION#{session_id}',
+            'sk': f'MESSAGE#{new_ulid()}',
+            'role': role,
+            'content': content,
+            'timestamp': timestamp,
+            'ttl': ttl,
+        }
+    
+    def build_meta_update(self, session_id: str, timestamp: str, ttl: int) -> dict:
+        """META の updated_at / ttl 更新パラメータを構築 (TransactWriteItems からも利用)"""
+        return {
+            'Key': {
                 'pk': f'SESSION#{session_id}',
                 'sk': 'META',
             },
-            UpdateExpression='SET updated_at = :now, #ttl = :ttl',
-            ExpressionAttributeNames={'#ttl': 'ttl'},
-            ExpressionAttributeValues={
+            'UpdateExpression': 'SET updated_at = :now, #ttl = :ttl',
+            'ExpressionAttributeNames': {'#ttl': 'ttl'},
+            'ExpressionAttributeValues': {
                 ':now': timestamp,
-                ':ttl': self._get_ttl(),
-            }
-        )
+                ':ttl': ttl,
+            },
+        }
+    
+    def build_turn_writes(
+        self,
+        session_id: str,
+        messages: list[tuple[str, str, str]],
+    ) -> list[dict]:
+        """
+        1ターン分のメッセージ書き込みを TransactItems 形式で構築
+        
+        Args:
+            session_id: セッションID
+            messages: [(role, content, timestamp), ...] (この順序で SK を採番)
+            
+        Returns:
+            list: TransactWriteItems の TransactItems
+        """
+        ttl = self._get_ttl()
+        items = [
+            {'Put': {
+                'TableName': self.table_name,
+                'Item': self.build_message_item(session_id, role, content, timestamp, ttl),
+            }}
+            for role, content, timestamp in messages
+        ]
+        
+        meta_due = [self._should_update_meta(session_id) for _ in messages]
+        if any(meta_due):
+            items.append({'Update': {
+                'TableName': self.table_name,
+                **self.build_meta_update(session_id, messages[-1][2], ttl),
+            }})
+        
+        return items
     
     async def get_history(
         self,
@@ -169,21 +341,134 @@ class DynamoDBSessionMemory:
         Returns:
             list: [{'role': str, 'content': str, 'timestamp': str}, ...]
         """
-        response = self.table.query(
-            KeyConditionExpression=Key('pk').eq(f'SESSION#{session_id}') & Key('sk').begins_with('MESSAGE#'),
+        cached = self._history_cache.get(session_id)
+        if cached is not None:
+            last_sk, complete, messages = cached
+            if not complete and len(messages) >= limit:
+                # 古い順の先頭 limit 件は後続の書き込みで変わらない
+                self._history_cache.move_to_end(session_id)
+                return messages[:limit]
+            if complete and await self._refresh_history(session_id, last_sk, messages):
+                self._history_cache.move_to_end(session_id)
+                return messages[:limit]
+        
+        # 直前のターンの書き込みを確実に含めるため DynamoDB から強い整合性で読む
+        response = await asyncio.to_thread(
+            self.table.query,
+            KeyConditionExpression=Key('pk').eq(f'SESSION#{session_id}') & Key('sk').begins_with(_MESSAGE_SK_PREFIX),
+            ProjectionExpression='sk, #r, #c, #t',
+            ExpressionAttributeNames={'#r': 'role', '#c': 'content', '#t': 'timestamp'},
             ScanIndexForward=True,  # 古い順
+            ConsistentRead=True,
             Limit=limit,
         )
         
-        messages = []
-        for item in response.get('Items', []):
-            messages.append({
-                'role': item['role'],
-                'content': item['content'],
-                'timestamp': item.get('timestamp'),
-            })
+        items = response.get('Items', [])
+        messages = [_history_entry(item) for item in items]
+        last_sk = items[-1]['sk'] if items else None
         
-        return messages
+        self._store_history(session_id, last_sk, 'LastEvaluatedKey' not in response, messages)
+        return list(messages)
+    
+    async def _refresh_history(
+        self,
+        session_id: str,
+        last_sk: Optional[str],
+        messages: list,
+    ) -> bool:
+        """
+        キャッシュ済み履歴に last_sk より後のメッセージを追記
+        
+        自インスタンス・他インスタンスの書き込みを区別せず取り込むため、
+        last_sk 以降の範囲だけを強い整合性で Query する
+        (通常は直前ターンのメッセージと last_sk の数件のみ)。
+        
+        Returns:
+            bool: キャッシュを最新化できたか (False の場合は全件を再取得)
+        """
+        response = await asyncio.to_thread(
+            self.table.query,
+            KeyConditionExpression=(
+                Key('pk').eq(f'SESSION#{session_id}')
+                & Key('sk').between(last_sk or _MESSAGE_SK_PREFIX, _MESSAGE_SK_MAX)
+            ),
+            ProjectionExpression='sk, #r, #c, #t',
+            ExpressionAttributeNames={'#r': 'role', '#c': 'content', '#t': 'timestamp'},
+            ScanIndexForward=True,
+            ConsistentRead=True,
+        )
+        if 'LastEvaluatedKey' in response:
+            return False
+        
+        new_items = [item for item in response.get('Items', []) if item['sk'] != last_sk]
+        if new_items:
+            messages.extend(_history_entry(item) for item in new_items)
+            self._history_cache[session_id] = (new_items[-1]['sk'], True, messages)
+        return True
+    
+    def _store_history(
+        self,
+        session_id: str,
+        last_sk: Optional[str],
+        complete: bool,
+        messages: list,
+    ) -> None:
+        """履歴を LRU キャッシュに格納"""
+        if self.history_cache_size <= 0:
+            return
+        
+        self._history_cache[session_id] = (last_sk, complete, list(messages))
+        self._history_cache.move_to_end(session_id)
+        while len(self._history_cache) > self.history_cache_size:
+            self._history_cache.popitem(last=False)
+    
+    async def get_cached_response(self, cache_key: str) -> Optional[str]:
+        """
+        キャッシュ済みの応答を取得
+        
+        TTL による削除は遅延するため、期限切れのアイテムはここで除外する。
+        
+        Args:
+            cache_key: 応答キャッシュキー
+            
+        Returns:
+            Optional[str]: キャッシュ済み応答 (ミス時は None)
+        """
+        response = await asyncio.to_thread(
+            self.table.get_item,
+            Key={
+                'pk': f'CACHE#{cache_key}',
+                'sk': 'RESP',
+            },
+        )
+        item = response.get('Item')
+        if not item or int(item.get('ttl', 0)) <= time.time():
+            return None
+        return item['response']
+    
+    async def put_cached_response(
+        self,
+        cache_key: str,
+        response: str,
+        ttl_seconds: int,
+    ) -> None:
+        """
+        応答をキャッシュに保存
+        
+        Args:
+            cache_key: 応答キャッシュキー
+            response: 応答テキスト
+            ttl_seconds: キャッシュ有効期間 (秒)
+        """
+        await asyncio.to_thread(
+            self.table.put_item,
+            Item={
+                'pk': f'CACHE#{cache_key}',
+                'sk': 'RESP',
+                'response': response,
+                'ttl': int(time.time()) + ttl_seconds,
+            },
+        )
 
 
 class DynamoDBLongTermMemory:
@@ -199,8 +484,21 @@ class DynamoDBLongTermMemory:
     - PK: AGGREGATE#{aggregate_id}
     - SK: EVENT#{timestamp}#{event_type}
     - GSI1: gsi1pk=USER#{user_id}, gsi1sk=EVENT#{timestamp}
+    
+    Query はページサイズを適応的に調整する: 小さい Limit から開始し、
+    目標レイテンシ内に収まる間は拡大、超えたら縮小する。
     """
     
+    # イベントの読み取りで返却する属性のみを射影
+    EVENT_PROJECTION = {
+        'ProjectionExpression': 'event_id, aggregate_id, event_type, #d, #ts',
+        'ExpressionAttributeNames': {'#d': 'data', '#ts': 'timestamp'},
+    }
+    
+    QUERY_TARGET_MS = 150
+    QUERY_INITIAL_BATCH = 32
+    QUERY_MAX_BATCH = 1000
+    
     def __init__(
         self,
         table_name: str = None,
@@ -210,7 +508,7 @@ class DynamoDBLongTermMemory:
             table_name: DynamoDB Event Store table name
         """
         self.table_name = table_name or os.environ.get('EVENT_STORE_TABLE', 'nova-event-store')
-        self.dynamodb = boto3.resource('dynamodb')
+        self.dynamodb = get_resource('dynamodb')
         self.table = self.dynamodb.Table(self.table_name)
     
     async def store_event(
@@ -232,6 +530,26 @@ class DynamoDBLongTermMemory:
         Returns:
             str: event_id
         """
+        event_id, item = self.build_event_item(aggregate_id, event_type, data, user_id)
+        
+        await asyncio.to_thread(self.table.put_item, Item=item)
+        
+        logger.debug(f"Stored event: {event_type} for aggregate: {aggregate_id}")
+        return event_id
+    
+    def build_event_item(
+        self,
+        aggregate_id: str,
+        event_type: str,
+        data: dict,
+        user_id: Optional[str] = None,
+    ) -> tuple[str, dict]:
+        """
+        イベントアイテムを構築 (TransactWriteItems からも利用)
+        
+        Returns:
+            tuple: (event_id, item)
+        """
         event_id = str(uuid.uuid4())
         now = datetime.utcnow().isoformat()
         
@@ -241,7 +559,7 @@ class DynamoDBLongTermMemory:
             'event_id': event_id,
             'aggregate_id': aggregate_id,
             'event_type': event_type,
-            'data': json.dumps(data, ensure_ascii=False),
+            'data': _to_attribute_value(data),
             'timestamp': now,
             'version': 1,
         }
@@ -251,10 +569,7 @@ class DynamoDBLongTermMemory:
             item['gsi1pk'] = f'USER#{user_id}'
             item['gsi1sk'] = f'EVENT#{now}'
         
-        self.table.put_item(Item=item)
-        
-        logger.debug(f"Stored event: {event_type} for aggregate: {aggregate_id}")
-        return event_id
+        return event_id, item
     
     async def get_events(
         self,
@@ -273,26 +588,27 @@ class DynamoDBLongTermMemory:
         Returns:
             list: イベントのリスト
         """
-        key_condition = Key('pk').eq(f'AGGREGATE#{aggregate_id}')
+        query_kwargs = {
+            'KeyConditionExpression': (
+                Key('pk').eq(f'AGGREGATE#{aggregate_id}') & Key('sk').begins_with('EVENT#')
+            ),
+            'ScanIndexForward': False,  # 新しい順
+            **self.EVENT_PROJECTION,
+        }
         
+        # SK は EVENT#{timestamp}#{event_type} のためタイプはフィルタで絞り込む
         if event_type:
-            key_condition = key_condition & Key('sk').begins_with(f'EVENT#')
-        else:
-            key_condition = key_condition & Key('sk').begins_with('EVENT#')
+            query_kwargs['FilterExpression'] = Attr('event_type').eq(event_type)
         
-        response = self.table.query(
-            KeyConditionExpression=key_condition,
-            ScanIndexForward=False,  # 新しい順
-            Limit=limit,
-        )
+        items = await asyncio.to_thread(self._query_adaptive, limit, **query_kwargs)
         
         events = []
-        for item in response.get('Items', []):
+        for item in items:
             event = {
                 'event_id': item['event_id'],
                 'aggregate_id': item['aggregate_id'],
                 'event_type': item['event_type'],
-                'data': json.loads(item['data']),
+                'data': _load_event_data(item['data']),
                 'timestamp': item['timestamp'],
             }
             events.append(event)
@@ -303,6 +619,7 @@ class DynamoDBLongTermMemory:
         self,
         user_id: str,
         limit: int = 10,
+        event_type_filter: Optional[str] = None,
     ) -> list:
         """
         ユーザーの最近のイベントを取得 (GSI1使用)
@@ -310,25 +627,30 @@ class DynamoDBLongTermMemory:
         Args:
             user_id: ユーザーID
             limit: 最大取得件数
+            event_type_filter: 取得するイベントタイプ (Query 側でフィルタ, optional)
             
         Returns:
             list: イベントのリスト
         """
+        query_kwargs = {
+            'IndexName': 'gsi1',
+            'KeyConditionExpression': Key('gsi1pk').eq(f'USER#{user_id}'),
+            'ScanIndexForward': False,  # 新しい順
+            **self.EVENT_PROJECTION,
+        }
+        if event_type_filter:
+            query_kwargs['FilterExpression'] = Attr('event_type').eq(event_type_filter)
+        
         try:
-            response = self.table.query(
-                IndexName='gsi1',
-                KeyConditionExpression=Key('gsi1pk').eq(f'USER#{user_id}'),
-                ScanIndexForward=False,  # 新しい順
-                Limit=limit,
-            )
+            items = await asyncio.to_thread(self._query_adaptive, limit, **query_kwargs)
             
             events = []
-            for item in response.get('Items', []):
+            for item in items:
                 event = {
                     'event_id': item.get('event_id'),
                     'aggregate_id': item.get('aggregate_id'),
                     'event_type': item.get('event_type'),
-                    'data': json.loads(item.get('data', '{}')),
+                    'data': _load_event_data(item.get('data')),
                     'timestamp': item.get('timestamp'),
                 }
                 events.append(event)
@@ -338,4 +660,34 @@ class DynamoDBLongTermMemory:
         except Exception as e:
             logger.warning(f"Failed to get recent events for user {user_id}: {e}")
             return []
-
+    
+    def _query_adaptive(self, limit: int, **query_kwargs) -> list:
+        """
+        適応的ページサイズで limit 件に達するまで Query (同期処理)
+        
+        FilterExpression は読み取り後に適用されるため、1ページで limit 件に
+        満たないことがある。ページの所要時間が QUERY_TARGET_MS に対して
+        短ければ次の Limit を拡大し、長ければ縮小する。
+        """
+        filtered = 'FilterExpression' in query_kwargs
+        batch = self.QUERY_INITIAL_BATCH
+        items = []
+        
+        while len(items) < limit:
+            page_limit = batch if filtered else min(batch, limit - len(items))
+            
+            start = time.monotonic()
+            response = self.table.query(Limit=page_limit, **query_kwargs)
+            elapsed_ms = (time.monotonic() - start) * 1000
+            
+            items.extend(response.get('Items', []))
+            
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                break
+            query_kwargs['ExclusiveStartKey'] = last_key
+            
+            batch = int(batch * self.QUERY_TARGET_MS / max(elapsed_ms, 1))
+            batch = max(1, min(self.QUERY_MAX_BATCH, batch))
+        
+        return items[:limit]
@@ -14,24 +14,36 @@ Nova Sonic を使用した音声処理ツール:
 - 精度: 清音環境で95%以上
 """
 import os
-import json
+import base64
+import asyncio
 import logging
 import time
-import random
 import hashlib
+from collections import deque
 from typing import Optional, AsyncIterator
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields
 from functools import wraps
 from datetime import datetime
 
-import boto3
-from botocore.exceptions import ClientError
+import numpy as np
+import orjson
+
+from src.infrastructure.gateways.clients import get_client
 
 logger = logging.getLogger(__name__)
 
 # Nova Sonic Model ID
 NOVA_SONIC_MODEL_ID = os.environ.get('NOVA_SONIC_MODEL_ID', 'amazon.nova-sonic-v1')
 
+# リアルタイム文字起こしで同時に推論中にできるチャンク数 (500ms x 4 = 2秒分)
+REALTIME_MAX_IN_FLIGHT = 4
+
+# リアルタイム文字起こしの無音判定しきい値 (16-bit PCM の RMS, 約 -44 dBFS)
+# これ未満のチャンクは推論せずに破棄する (0 で無効)
+REALTIME_SILENCE_RMS = float(os.environ.get('REALTIME_SILENCE_RMS', '200'))
+
+# レスポンス本文のパースは orjson (bytes をそのまま受け取れる)
+_loads = orjson.loads
 
 def tool(name: str, description: str):
     """
@@ -56,7 +68,7 @@ def tool(name: str, description: str):
 # Data Classes
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionSegment:
     """文字起こしセグメント"""
     text: str
@@ -66,7 +78,7 @@ class TranscriptionSegment:
     speaker_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionResult:
     """文字起こし結果"""
     text: str
@@ -78,7 +90,7 @@ class TranscriptionResult:
     model_id: str = NOVA_SONIC_MODEL_ID
 
 
-@dataclass
+@dataclass(slots=True)
 class SpeakerInfo:
     """話者情報"""
     speaker_id: str
@@ -87,7 +99,7 @@ class SpeakerInfo:
     segments: list[dict] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmotionScore:
     """感情スコア"""
     emotion: str  # joy, sadness, anger, fear, surprise, disgust, neutral
@@ -95,7 +107,7 @@ class EmotionScore:
     timestamp: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioAnalysisResult:
     """音声分析結果"""
     sentiment: str  # positive, negative, neutral
@@ -108,65 +120,33 @@ class AudioAnalysisResult:
 
 
 # =============================================================================
-# Retry Utilities
+# Invoke Utilities
 # =============================================================================
 
-def invoke_with_retry(
+async def invoke_model(
     client,
     model_id: str,
     body: dict | bytes,
     content_type: str = 'application/json',
-    max_retries: int = 3,
 ) -> dict:
     """
-    リトライ機能付きモデル呼び出し
+    モデル呼び出し
     
-    指数バックオフを使用してスロットリングに対応。
+    リトライは共有クライアント設定 (CLIENT_CONFIG) の adaptive モードで botocore が実施。
+    同期 API はスレッドで実行し、イベントループをブロックしない。
     """
-    for attempt in range(max_retries):
-        try:
-            if isinstance(body, dict):
-                body = json.dumps(body)
-            elif isinstance(body, str):
-                body = body.encode('utf-8')
-            
-            response = client.invoke_model(
-                modelId=model_id,
-                contentType=content_type,
-                accept='application/json',
-                body=body,
-            )
-            return response
-            
-        except ClientError as e:
-            error_code = e.response.get('Error', {}).get('Code', '')
-            
-            if error_code == 'ThrottlingException':
-                wait_time = (2 ** attempt) + random.uniform(0, 1)
-                logger.warning(f"Rate limited. Waiting {wait_time:.2f}s (attempt {attempt + 1}/{max_retries})")
-                time.sleep(wait_time)
-                
-            elif error_code == 'ModelTimeoutException':
-                logger.warning(f"Model timeout (attempt {attempt + 1}/{max_retries})")
-                if attempt == max_retries - 1:
-                    raise
-                time.sleep(1)
-                
-            elif error_code in ['ServiceUnavailableException', 'InternalServerException']:
-                wait_time = (2 ** attempt) + random.uniform(0, 1)
-                logger.warning(f"Service error. Waiting {wait_time:.2f}s")
-                time.sleep(wait_time)
-                
-            else:
-                raise
-                
-        except Exception as e:
-            logger.error(f"Unexpected error: {e}")
-            if attempt == max_retries - 1:
-                raise
-            time.sleep(1)
+    if isinstance(body, dict):
+        body = orjson.dumps(body)
+    elif isinstance(body, str):
+        body = body.encode('utf-8')
     
-    raise Exception(f"Failed after {max_retries} attempts")
+    return await asyncio.to_thread(
+        client.invoke_model,
+        modelId=model_id,
+        contentType=content_type,
+        accept='application/json',
+        body=body,
+    )
 
 
 # =============================================================================
@@ -198,7 +178,7 @@ async def transcribe_audio(
     start_time = time.time()
     logger.info(f"Transcribing audio: {audio_url} (language: {language}, speakers: {enable_speaker_diarization})")
     
-    bedrock = boto3.client('bedrock-runtime')
+    bedrock = get_client('bedrock-runtime')
     
     request_body = {
         'audioUrl': audio_url,
@@ -213,25 +193,26 @@ async def transcribe_audio(
     }
     
     try:
-        response = invoke_with_retry(
+        response = await invoke_model(
             client=bedrock,
             model_id=NOVA_SONIC_MODEL_ID,
             body=request_body,
         )
         
-        result = json.loads(response['body'].read())
+        result = _loads(response['body'].read())
         processing_time = time.time() - start_time
         
         # セグメントを構造化
-        segments = []
-        for seg in result.get('segments', []):
-            segments.append(TranscriptionSegment(
+        segments = [
+            TranscriptionSegment(
                 text=seg.get('text', ''),
                 start_time=seg.get('startTime', 0.0),
                 end_time=seg.get('endTime', 0.0),
                 confidence=seg.get('confidence', 0.0),
                 speaker_id=seg.get('speakerId'),
-            ))
+            )
+            for seg in result.get('segments', [])
+        ]
         
         return TranscriptionResult(
             text=result.get('transcription', ''),
@@ -282,7 +263,7 @@ async def analyze_audio(
     analysis_types = analysis_types or ["sentiment", "speaker_diarization", "emotion"]
     logger.info(f"Analyzing audio: {audio_url} (types: {analysis_types})")
     
-    bedrock = boto3.client('bedrock-runtime')
+    bedrock = get_client('bedrock-runtime')
     
     request_body = {
         'audioUrl': audio_url,
@@ -295,38 +276,45 @@ async def analyze_audio(
     }
     
     try:
-        response = invoke_with_retry(
+        response = await invoke_model(
             client=bedrock,
             model_id=NOVA_SONIC_MODEL_ID,
             body=request_body,
         )
         
-        result = json.loads(response['body'].read())
+        result = _loads(response['body'].read())
         
         # 話者情報を構造化
-        speakers = []
-        for spk in result.get('speakers', []):
-            speakers.append(SpeakerInfo(
+        speakers = [
+            SpeakerInfo(
                 speaker_id=spk.get('speakerId', ''),
                 speaking_time=spk.get('speakingTime', 0.0),
                 turn_count=spk.get('turnCount', 0),
                 segments=spk.get('segments', []),
-            ))
+            )
+            for spk in result.get('speakers', [])
+        ]
         
         # 感情スコアを構造化
-        emotions = []
-        for emo in result.get('emotions', []):
-            emotions.append(EmotionScore(
+        raw_emotions = result.get('emotions', [])
+        emotions = [
+            EmotionScore(
                 emotion=emo.get('emotion', 'neutral'),
                 score=emo.get('score', 0.0),
                 timestamp=emo.get('timestamp'),
-            ))
+            )
+            for emo in raw_emotions
+        ]
         
-        # 支配的な感情を決定
+        # 支配的な感情を決定 (スコア列を配列化して argmax)
         dominant_emotion = 'neutral'
-        if emotions:
-            dominant = max(emotions, key=lambda e: e.score)
-            dominant_emotion = dominant.emotion
+        if raw_emotions:
+            scores = np.fromiter(
+                (emo.get('score', 0.0) for emo in raw_emotions),
+                dtype=np.float32,
+                count=len(raw_emotions),
+            )
+            dominant_emotion = emotions[int(scores.argmax())].emotion
         
         return AudioAnalysisResult(
             sentiment=result.get('sentiment', 'neutral'),
@@ -359,6 +347,7 @@ async def transcribe_realtime(
     audio_stream: AsyncIterator[bytes],
     language: str = "ja-JP",
     sample_rate: int = 16000,
+    silence_threshold: float = REALTIME_SILENCE_RMS,
 ) -> AsyncIterator[TranscriptionSegment]:
     """
     リアルタイム文字起こし (Nova Sonic Streaming)
@@ -367,6 +356,7 @@ async def transcribe_realtime(
         audio_stream: 音声データのストリーム (チャンク単位)
         language: 言語コード
         sample_rate: サンプリングレート (8000-48000)
+        silence_threshold: 無音と判定する RMS しきい値 (0 で無効)
         
     Yields:
         TranscriptionSegment: 文字起こしセグメント (リアルタイム)
@@ -376,46 +366,121 @@ async def transcribe_realtime(
     # Note: 実際の Bedrock Streaming API が利用可能になり次第実装
     # 現在はプレースホルダー実装
     
-    bedrock = boto3.client('bedrock-runtime')
+    bedrock = get_client('bedrock-runtime')
     
-    buffer = b''
+    # bytearray は先頭の del をオフセット移動で処理するため、
+    # 連結・スライスのたびに残りのバッファ全体をコピーしない
+    buffer = bytearray()
     chunk_duration = 0.5  # 500ms chunks
     chunk_size = int(sample_rate * chunk_duration * 2)  # 16-bit audio
     
-    async for audio_chunk in audio_stream:
-        buffer += audio_chunk
-        
-        while len(buffer) >= chunk_size:
-            chunk = buffer[:chunk_size]
-            buffer = buffer[chunk_size:]
+    # チャンクの推論はタスクとして先行実行し、次のチャンクの受信と重ねる。
+    # 結果は送信順 (FIFO) に返し、同時実行数を超えたら先頭の完了を待つ。
+    pending: deque[asyncio.Task] = deque()
+    
+    try:
+        async for audio_chunk in audio_stream:
+            buffer.extend(audio_chunk)
             
-            try:
-                # ストリーミングAPI呼び出し (プレースホルダー)
-                response = invoke_with_retry(
-                    client=bedrock,
-                    model_id=NOVA_SONIC_MODEL_ID,
-                    body={
-                        'audioChunk': chunk.hex(),
-                        'language': language,
-                        'sampleRate': sample_rate,
-                        'task': 'streaming_transcription',
-                    },
-                )
+            while len(buffer) >= chunk_size:
+                chunk = bytes(buffer[:chunk_size])
+                del buffer[:chunk_size]
+                
+                # 無音チャンクは Bedrock を呼び出さない
+                if silence_threshold and _pcm_rms(chunk) < silence_threshold:
+                    continue
                 
-                result = json.loads(response['body'].read())
+                pending.append(asyncio.create_task(
+                    _transcribe_chunk(bedrock, chunk, language, sample_rate)
+                ))
                 
-                if result.get('isFinal', False):
-                    yield TranscriptionSegment(
-                        text=result.get('text', ''),
-                        start_time=result.get('startTime', 0.0),
-                        end_time=result.get('endTime', 0.0),
-                        confidence=result.get('confidence', 0.0),
-                        speaker_id=result.get('speakerId'),
-                    )
-                    
-            except Exception as e:
-                logger.error(f"Streaming transcription error: {e}")
-                continue
+                while pending and (pending[0].done() or len(pending) > REALTIME_MAX_IN_FLIGHT):
+                    segment = await pending.popleft()
+                    if segment is not None:
+                        yield segment
+        
+        while pending:
+            segment = await pending.popleft()
+            if segment is not None:
+                yield segment
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _pcm_rms(chunk: bytes) -> float:
+    """16-bit PCM チャンクの RMS (二乗平均平方根) を計算"""
+    samples = np.frombuffer(chunk, dtype=np.int16, count=len(chunk) // 2)
+    if samples.size == 0:
+        return 0.0
+    samples = samples.astype(np.float32)
+    return float(np.sqrt(np.dot(samples, samples) / samples.size))
+
+
+async def encode_segments_ndjson(
+    segments: AsyncIterator[TranscriptionSegment],
+) -> AsyncIterator[bytes]:
+    """
+    文字起こしセグメントを NDJSON フレームに変換
+    
+    transcribe_realtime の出力を WebSocket / HTTP ストリームへ中継する際に使用。
+    1 セグメントにつき orjson.dumps 1 回で、改行終端の 1 フレームを生成する。
+    
+    Args:
+        segments: transcribe_realtime が返すセグメントのストリーム
+        
+    Yields:
+        bytes: NDJSON フレーム (1 行 = 1 セグメント)
+    """
+    async for segment in segments:
+        yield orjson.dumps(
+            {
+                'text': segment.text,
+                'startTime': segment.start_time,
+                'endTime': segment.end_time,
+                'confidence': segment.confidence,
+                'speakerId': segment.speaker_id,
+            },
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+
+
+async def _transcribe_chunk(
+    client,
+    chunk: bytes,
+    language: str,
+    sample_rate: int,
+) -> Optional[TranscriptionSegment]:
+    """リアルタイム文字起こしの 1 チャンク分を推論 (確定結果のみ返す)"""
+    try:
+        # ストリーミングAPI呼び出し (プレースホルダー)
+        response = await invoke_model(
+            client=client,
+            model_id=NOVA_SONIC_MODEL_ID,
+            body={
+                'audioChunk': base64.b64encode(chunk).decode('ascii'),
+                'language': language,
+                'sampleRate': sample_rate,
+                'task': 'streaming_transcription',
+            },
+        )
+        
+        result = _loads(response['body'].read())
+        
+    except Exception as e:
+        logger.error(f"Streaming transcription error: {e}")
+        return None
+    
+    if not result.get('isFinal', False):
+        return None
+    
+    return TranscriptionSegment(
+        text=result.get('text', ''),
+        start_time=result.get('startTime', 0.0),
+        end_time=result.get('endTime', 0.0),
+        confidence=result.get('confidence', 0.0),
+        speaker_id=result.get('speakerId'),
+    )
 
 
 @tool(
@@ -436,7 +501,7 @@ async def detect_speech_quality(
     """
     logger.info(f"Detecting speech quality: {audio_url}")
     
-    bedrock = boto3.client('bedrock-runtime')
+    bedrock = get_client('bedrock-runtime')
     
     request_body = {
         'audioUrl': audio_url,
@@ -444,13 +509,13 @@ async def detect_speech_quality(
     }
     
     try:
-        response = invoke_with_retry(
+        response = await invoke_model(
             client=bedrock,
             model_id=NOVA_SONIC_MODEL_ID,
             body=request_body,
         )
         
-        result = json.loads(response['body'].read())
+        result = _loads(response['body'].read())
         
         return {
             'overall_quality': result.get('overallQuality', 'unknown'),
@@ -478,21 +543,35 @@ async def detect_speech_quality(
 # Utility Functions
 # =============================================================================
 
+# データクラスごとのフィールド名 (初回の直列化時に fields() から構築)
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+def _to_builtin(value):
+    """データクラス / list / dict を再帰的に組み込み型へ変換"""
+    cls = type(value)
+    if hasattr(cls, '__dataclass_fields__'):
+        names = _FIELD_NAMES.get(cls)
+        if names is None:
+            names = _FIELD_NAMES[cls] = tuple(f.name for f in fields(cls))
+        return {name: _to_builtin(getattr(value, name)) for name in names}
+    if cls is list:
+        return [_to_builtin(item) for item in value]
+    if cls is dict:
+        return {key: _to_builtin(item) for key, item in value.items()}
+    return value
+
+
 def serialize_result(result) -> dict:
     """結果をJSON直列化可能な形式に変換"""
     if hasattr(result, '__dataclass_fields__'):
-        data = asdict(result)
-        # ネストされたデータクラスを処理
-        for key, value in data.items():
-            if isinstance(value, list):
-                data[key] = [
-                    asdict(item) if hasattr(item, '__dataclass_fields__') else item
-                    for item in value
-                ]
-        return data
+        # dataclasses.asdict は全ノードを deepcopy するため、
+        # キャッシュしたフィールド名で 1 パス変換する
+        return _to_builtin(result)
     return result
 
 
 def create_audio_hash(audio_url: str) -> str:
     """音声URLからハッシュを生成（キャッシュキー用）"""
-    return hashlib.md5(audio_url.encode()).hexdigest()
+    # 暗号学的強度は不要なため、MD5 より高速な BLAKE2b を使用 (128bit)
+    return hashlib.blake2b(audio_url.encode(), digest_size=16).hexdigest()
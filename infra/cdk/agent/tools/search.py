@@ -7,7 +7,9 @@ Nova Multimodal Embeddings + S3 Vectors を使用:
 - Knowledge Base 統合
 """
 import os
+import hashlib
 import logging
+from collections import OrderedDict
 from typing import Optional
 from dataclasses import dataclass
 
@@ -22,10 +24,29 @@ from src.infrastructure.gateways.s3 import (
     S3VectorsGateway,
     DistanceMetric,
     VectorRecord,
+    quantize_vector,
 )
 
 logger = logging.getLogger(__name__)
 
+# S3 Vectors が利用できない環境 (未対応リージョン等) では false を設定し、
+# 埋め込み生成を行わずにモック結果を返す
+S3_VECTORS_ENABLED = os.environ.get('S3_VECTORS_ENABLED', 'true').lower() == 'true'
+
+
+# 次元数マッピング
+_DIM_MAPPING: dict[int, EmbeddingDimension] = {
+    256: EmbeddingDimension.DIM_256,
+    384: EmbeddingDimension.DIM_384,
+    1024: EmbeddingDimension.DIM_1024,
+}
+
+# 距離メトリックマッピング
+_METRIC_MAPPING: dict[str, DistanceMetric] = {
+    "cosine": DistanceMetric.COSINE,
+    "euclidean": DistanceMetric.EUCLIDEAN,
+    "dotProduct": DistanceMetric.DOT_PRODUCT,
+}
 
 # Gateway シングルトン
 _embeddings_gateway: Optional[NovaEmbeddingsGateway] = None
@@ -53,7 +74,82 @@ def get_vectors_gateway() -> S3VectorsGateway:
     return _vectors_gateway
 
 
-@dataclass
+# 埋め込み結果の LRU キャッシュ (同一クエリの再試行・ページングで Bedrock 呼び出しを省略)
+EMBEDDING_CACHE_SIZE = 1024
+_embedding_cache: OrderedDict[bytes, GatewayEmbeddingResult] = OrderedDict()
+
+
+def _embedding_cache_key(
+    text: Optional[str],
+    s3_key: Optional[str],
+    output_dimension: EmbeddingDimension,
+) -> bytes:
+    """テキスト・画像キー・次元数から埋め込みキャッシュキーを生成"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update((text or '').encode('utf-8'))
+    digest.update(b'\0')
+    digest.update((s3_key or '').encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(str(output_dimension.value).encode('ascii'))
+    return digest.digest()
+
+
+async def _embed(
+    gateway: NovaEmbeddingsGateway,
+    text: Optional[str],
+    s3_key: Optional[str],
+    output_dimension: EmbeddingDimension,
+) -> GatewayEmbeddingResult:
+    """
+    入力に応じた埋め込みを生成 (キャッシュ優先)
+    
+    Args:
+        gateway: Nova Embeddings Gateway
+        text: テキスト入力 (optional)
+        s3_key: 画像のS3キー (optional)
+        output_dimension: 出力次元数
+        
+    Returns:
+        GatewayEmbeddingResult: 埋め込み結果 (キャッシュ共有のため変更しないこと)
+    """
+    key = _embedding_cache_key(text, s3_key, output_dimension)
+    cached = _embedding_cache.get(key)
+    if cached is not None:
+        _embedding_cache.move_to_end(key)
+        return cached
+    
+    if text and s3_key:
+        # マルチモーダル
+        result = await gateway.generate_multimodal_embedding(
+            text=text,
+            s3_key=s3_key,
+            output_dimension=output_dimension,
+        )
+    elif text:
+        # テキストのみ
+        result = await gateway.generate_text_embedding(
+            text=text,
+            output_dimension=output_dimension,
+        )
+    else:
+        # 画像のみ
+        result = await gateway.generate_image_embedding(
+            s3_key=s3_key,
+            output_dimension=output_dimension,
+        )
+    
+    _cache_embedding(key, result)
+    return result
+
+
+def _cache_embedding(key: bytes, result: GatewayEmbeddingResult) -> None:
+    """埋め込み結果をキャッシュに追加 (上限を超えたら最も古いものを破棄)"""
+    _embedding_cache[key] = result
+    if len(_embedding_cache) > EMBEDDING_CACHE_SIZE:
+        _embedding_cache.popitem(last=False)
+
+
+@dataclass(slots=True)
 class SearchResult:
     """検索結果"""
     documents: list
@@ -88,24 +184,22 @@ async def search_knowledge(
     
     logger.info(f"Searching knowledge base: query={query}, image={query_image_url}, top_k={top_k}")
     
+    # プロセス間で安定したクエリID (組み込み hash() は PYTHONHASHSEED で変わる)
+    query_key = query or query_image_url
+    query_id = f"query-{hashlib.blake2b(query_key.encode(), digest_size=8).hexdigest()}"
+    
+    if not S3_VECTORS_ENABLED:
+        # 検索できないため、埋め込み生成 (Bedrock 呼び出し) を省略
+        return _mock_search_result(query_id, top_k)
+    
     gateway = get_embeddings_gateway()
     
     try:
         # 1. クエリの埋め込みベクトルを生成
-        if query and query_image_url:
-            # マルチモーダル
-            s3_key = query_image_url.replace("s3://", "") if query_image_url.startswith("s3://") else query_image_url
-            embedding_result = await gateway.generate_multimodal_embedding(
-                text=query,
-                s3_key=s3_key,
-            )
-        elif query:
-            # テキストのみ
-            embedding_result = await gateway.generate_text_embedding(text=query)
-        else:
-            # 画像のみ
+        s3_key = None
+        if query_image_url:
             s3_key = query_image_url.replace("s3://", "") if query_image_url.startswith("s3://") else query_image_url
-            embedding_result = await gateway.generate_image_embedding(s3_key=s3_key)
+        embedding_result = await _embed(gateway, query, s3_key, EmbeddingDimension.DIM_1024)
         
         # 2. S3 Vectors で検索
         content_bucket = os.environ.get('CONTENT_BUCKET', 'nova-content-bucket')
@@ -133,7 +227,7 @@ async def search_knowledge(
                     for r in query_response.results
                 ],
                 "total_count": len(query_response.results),
-                "query_id": f'query-{hash(query or query_image_url) % 10000}',
+                "query_id": query_id,
                 "embedding_dimension": embedding_result.dimension,
                 "embedding_modality": embedding_result.modality.value,
                 "vectors_scanned": query_response.total_vectors_scanned,
@@ -142,20 +236,9 @@ async def search_knowledge(
             # S3 Vectors未対応リージョンの場合はモック結果を返す
             logger.warning(f"S3 Vectors query failed (may not be GA): {vectors_error}")
             return {
-                "documents": [
-                    {
-                        'document_id': f'doc-{i}',
-                        'score': 0.95 - (i * 0.05),
-                        'content': f'[Mock document {i} - S3 Vectors not available]',
-                        'metadata': {'source': 'mock', 'reason': 's3-vectors-not-available'},
-                    }
-                    for i in range(min(3, top_k))
-                ],
-                "total_count": 3,
-                "query_id": f'query-{hash(query or query_image_url) % 10000}',
+                **_mock_search_result(query_id, top_k),
                 "embedding_dimension": embedding_result.dimension,
                 "embedding_modality": embedding_result.modality.value,
-                "warning": "S3 Vectors API not available, using mock results",
             }
         
     except Exception as e:
@@ -168,6 +251,24 @@ async def search_knowledge(
         }
 
 
+def _mock_search_result(query_id: str, top_k: int) -> dict:
+    """S3 Vectors が利用できない場合のモック検索結果"""
+    return {
+        "documents": [
+            {
+                'document_id': f'doc-{i}',
+                'score': 0.95 - (i * 0.05),
+                'content': f'[Mock document {i} - S3 Vectors not available]',
+                'metadata': {'source': 'mock', 'reason': 's3-vectors-not-available'},
+            }
+            for i in range(min(3, top_k))
+        ],
+        "total_count": 3,
+        "query_id": query_id,
+        "warning": "S3 Vectors API not available, using mock results",
+    }
+
+
 @tool(
     name="generate_embeddings",
     description="テキストまたは画像の埋め込みベクトルを生成します。Nova Multimodal Embeddingsを使用。"
@@ -195,36 +296,16 @@ async def generate_embeddings(
     
     gateway = get_embeddings_gateway()
     
-    # 次元数マッピング
-    dim_mapping = {
-        256: EmbeddingDimension.DIM_256,
-        384: EmbeddingDimension.DIM_384,
-        1024: EmbeddingDimension.DIM_1024,
-    }
-    output_dimension = dim_mapping.get(dimension, EmbeddingDimension.DIM_1024)
+    output_dimension = _DIM_MAPPING.get(dimension, EmbeddingDimension.DIM_1024)
     
     try:
-        if text and image_url:
+        s3_key = None
+        if image_url:
             s3_key = image_url.replace("s3://", "") if image_url.startswith("s3://") else image_url
-            result = await gateway.generate_multimodal_embedding(
-                text=text,
-                s3_key=s3_key,
-                output_dimension=output_dimension,
-            )
-        elif text:
-            result = await gateway.generate_text_embedding(
-                text=text,
-                output_dimension=output_dimension,
-            )
-        else:
-            s3_key = image_url.replace("s3://", "") if image_url.startswith("s3://") else image_url
-            result = await gateway.generate_image_embedding(
-                s3_key=s3_key,
-                output_dimension=output_dimension,
-            )
+        result = await _embed(gateway, text, s3_key, output_dimension)
         
         return {
-            "embedding": result.embedding,
+            "embedding": result.embedding.tolist(),
             "dimension": result.dimension,
             "modality": result.modality.value,
             "input_token_count": result.input_token_count,
@@ -269,31 +350,49 @@ async def generate_batch_embeddings(
     
     gateway = get_embeddings_gateway()
     
-    dim_mapping = {
-        256: EmbeddingDimension.DIM_256,
-        384: EmbeddingDimension.DIM_384,
-        1024: EmbeddingDimension.DIM_1024,
-    }
-    output_dimension = dim_mapping.get(dimension, EmbeddingDimension.DIM_1024)
+    output_dimension = _DIM_MAPPING.get(dimension, EmbeddingDimension.DIM_1024)
     
     try:
-        result = await gateway.generate_batch_embeddings(
-            texts=texts,
-            output_dimension=output_dimension,
-        )
+        # キャッシュ済みのテキストは Bedrock を呼ばず、未キャッシュ分だけをバッチ生成
+        keys = [_embedding_cache_key(text, None, output_dimension) for text in texts]
+        embeddings: list[Optional[GatewayEmbeddingResult]] = []
+        misses: list[int] = []
+        for i, key in enumerate(keys):
+            cached = _embedding_cache.get(key)
+            if cached is not None:
+                _embedding_cache.move_to_end(key)
+            else:
+                misses.append(i)
+            embeddings.append(cached)
+        
+        total_input_tokens = 0
+        error_count = 0
+        if misses:
+            result = await gateway.generate_batch_embeddings(
+                texts=[texts[i] for i in misses],
+                output_dimension=output_dimension,
+            )
+            total_input_tokens = result.total_input_tokens
+            error_count = result.error_count
+            for i, e in zip(misses, result.embeddings):
+                embeddings[i] = e
+                # 失敗時のゼロベクトルはキャッシュしない
+                if e.embedding.any():
+                    _cache_embedding(keys[i], e)
         
         return {
             "embeddings": [
                 {
-                    "embedding": e.embedding,
+                    "embedding": e.embedding.tolist(),
                     "dimension": e.dimension,
                     "modality": e.modality.value,
                 }
-                for e in result.embeddings
+                for e in embeddings
             ],
-            "total_input_tokens": result.total_input_tokens,
-            "success_count": result.success_count,
-            "error_count": result.error_count,
+            "total_input_tokens": total_input_tokens,
+            "success_count": len(texts) - error_count,
+            "error_count": error_count,
+            "cache_hits": len(texts) - len(misses),
         }
         
     except Exception as e:
@@ -325,10 +424,28 @@ async def compute_similarity(
     Returns:
         dict: 類似度スコア
     """
-    gateway = get_embeddings_gateway()
+    return compute_similarity_sync(embedding1, embedding2)
+
+
+def compute_similarity_sync(
+    embedding1: list[float],
+    embedding2: list[float],
+) -> dict:
+    """
+    コサイン類似度を計算 (同期版)
+    
+    I/O を伴わないため、Lambda ハンドラからはイベントループを介さず直接呼び出す。
     
+    Args:
+        embedding1: ベクトル1
+        embedding2: ベクトル2
+        
+    Returns:
+        dict: 類似度スコア
+    """
     try:
-        similarity = gateway.compute_similarity(embedding1, embedding2)
+        # 純粋な計算のみのため Gateway (Bedrock クライアント) は生成しない
+        similarity = NovaEmbeddingsGateway.compute_similarity(embedding1, embedding2)
         return {
             "similarity": similarity,
             "dimension": len(embedding1),
@@ -369,12 +486,7 @@ async def create_vector_index(
     
     gateway = get_vectors_gateway()
     
-    metric_mapping = {
-        "cosine": DistanceMetric.COSINE,
-        "euclidean": DistanceMetric.EUCLIDEAN,
-        "dotProduct": DistanceMetric.DOT_PRODUCT,
-    }
-    metric = metric_mapping.get(distance_metric, DistanceMetric.COSINE)
+    metric = _METRIC_MAPPING.get(distance_metric, DistanceMetric.COSINE)
     
     try:
         result = await gateway.create_index(
@@ -404,6 +516,7 @@ async def put_vectors(
     bucket_name: str,
     index_name: str,
     vectors: list[dict],
+    precision: str = "fp16",
 ) -> dict:
     """
     ベクトルを追加・更新 (S3 Vectors)
@@ -412,6 +525,7 @@ async def put_vectors(
         bucket_name: S3バケット名
         index_name: インデックス名
         vectors: ベクトルリスト [{"key": "...", "vector": [...], "metadata": {...}}]
+        precision: 送信精度 (fp32, fp16, int8)
         
     Returns:
         dict: 結果
@@ -424,7 +538,7 @@ async def put_vectors(
         records = [
             VectorRecord(
                 key=v["key"],
-                vector=v["vector"],
+                vector=quantize_vector(v["vector"], precision),
                 metadata=v.get("metadata", {}),
             )
             for v in vectors
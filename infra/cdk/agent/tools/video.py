@@ -7,8 +7,10 @@ Nova Omni を使用した映像処理ツール:
 - 異常検知
 """
 import os
+import asyncio
+import binascii
 import logging
-from typing import Optional
+from functools import lru_cache
 
 from .audio import tool
 from src.infrastructure.gateways.bedrock import (
@@ -19,20 +21,25 @@ from src.infrastructure.gateways.bedrock import (
 
 logger = logging.getLogger(__name__)
 
-
-# Nova Omni Gateway シングルトン
-_gateway: Optional[NovaOmniGateway] = None
+# ツール引数の解析タイプ → Gateway の解析タイプ
+_ANALYSIS_TYPE_MAP = {
+    "scene": VideoAnalysisType.SCENE_UNDERSTANDING,
+    "object": VideoAnalysisType.OBJECT_DETECTION,
+    "action": VideoAnalysisType.ACTION_RECOGNITION,
+    "event": VideoAnalysisType.TEMPORAL_ANALYSIS,
+    "anomaly": VideoAnalysisType.ANOMALY_DETECTION,
+}
 
 
+@lru_cache(maxsize=1)
 def get_gateway() -> NovaOmniGateway:
-    """Nova Omni Gateway インスタンスを取得"""
-    global _gateway
-    if _gateway is None:
-        _gateway = NovaOmniGateway(
-            region=os.environ.get("AWS_REGION", "us-east-1"),
-            model_id=os.environ.get("NOVA_OMNI_MODEL_ID", "amazon.nova-pro-v1:0"),
-        )
-    return _gateway
+    """Nova Omni Gateway インスタンスを取得 (プロセス内で 1 度だけ生成)"""
+    return NovaOmniGateway(
+        region=os.environ.get("AWS_REGION", "us-east-1"),
+        model_id=os.environ.get("NOVA_OMNI_MODEL_ID", "amazon.nova-pro-v1:0"),
+        # レイテンシ最適化推論 (未対応のモデル / リージョンでは standard にフォールバック)
+        performance_latency=os.environ.get("NOVA_OMNI_PERFORMANCE_LATENCY", "optimized"),
+    )
 
 
 @tool(
@@ -61,26 +68,14 @@ async def analyze_video(
     gateway = get_gateway()
     
     # 解析タイプをマッピング
-    type_mapping = {
-        "scene": VideoAnalysisType.SCENE_UNDERSTANDING,
-        "object": VideoAnalysisType.OBJECT_DETECTION,
-        "action": VideoAnalysisType.ACTION_RECOGNITION,
-        "event": VideoAnalysisType.TEMPORAL_ANALYSIS,
-        "anomaly": VideoAnalysisType.ANOMALY_DETECTION,
-    }
-    
-    mapped_types = [
-        type_mapping.get(t, VideoAnalysisType.SCENE_UNDERSTANDING)
-        for t in analysis_types
-        if t in type_mapping
-    ]
+    mapped_types = _map_analysis_types(analysis_types)
     
     # temporal_analysisが有効なら時系列分析を追加
     if temporal_analysis and VideoAnalysisType.TEMPORAL_ANALYSIS not in mapped_types:
         mapped_types.append(VideoAnalysisType.TEMPORAL_ANALYSIS)
     
     # S3 URLからキーを抽出
-    s3_key = video_url.replace("s3://", "") if video_url.startswith("s3://") else video_url
+    s3_key = _to_s3_key(video_url)
     
     try:
         result: GatewayResult = await gateway.analyze_video(
@@ -88,18 +83,12 @@ async def analyze_video(
             analysis_types=mapped_types,
         )
         
+        scenes, detected_objects = _collect_scenes_and_objects(result.frames)
+        
         return {
             "summary": result.summary,
-            "scenes": [
-                {
-                    "timestamp_ms": f.timestamp_ms,
-                    "description": f.description,
-                    "objects": f.objects,
-                    "confidence": f.confidence,
-                }
-                for f in result.frames
-            ],
-            "detected_objects": _extract_objects(result.frames),
+            "scenes": scenes,
+            "detected_objects": detected_objects,
             "events": result.temporal_events,
             "anomalies": result.anomalies,
             "metadata": result.metadata,
@@ -140,7 +129,7 @@ async def detect_video_anomalies(
     logger.info(f"Detecting anomalies in video: {video_url}")
     
     gateway = get_gateway()
-    s3_key = video_url.replace("s3://", "") if video_url.startswith("s3://") else video_url
+    s3_key = _to_s3_key(video_url)
     
     try:
         anomalies = await gateway.detect_anomalies(
@@ -182,29 +171,15 @@ async def analyze_video_frames(
     Returns:
         dict: 分析結果
     """
-    import base64
-    
     analysis_types = analysis_types or ["scene", "object"]
     logger.info(f"Analyzing {len(frames_base64)} frames")
     
     gateway = get_gateway()
     
-    type_mapping = {
-        "scene": VideoAnalysisType.SCENE_UNDERSTANDING,
-        "object": VideoAnalysisType.OBJECT_DETECTION,
-        "action": VideoAnalysisType.ACTION_RECOGNITION,
-        "event": VideoAnalysisType.TEMPORAL_ANALYSIS,
-        "anomaly": VideoAnalysisType.ANOMALY_DETECTION,
-    }
-    
-    mapped_types = [
-        type_mapping.get(t, VideoAnalysisType.SCENE_UNDERSTANDING)
-        for t in analysis_types
-        if t in type_mapping
-    ]
+    mapped_types = _map_analysis_types(analysis_types)
     
-    # Base64デコード
-    frames_bytes = [base64.b64decode(f) for f in frames_base64]
+    # Base64デコード (フレーム数が多いと CPU を占有するためスレッドで実行)
+    frames_bytes = await asyncio.to_thread(_decode_frames, frames_base64)
     
     try:
         result: GatewayResult = await gateway.analyze_frames(
@@ -238,25 +213,61 @@ async def analyze_video_frames(
         }
 
 
-def _extract_objects(frames: list) -> list:
-    """フレームからユニークなオブジェクトを抽出"""
-    all_objects = {}
+def _map_analysis_types(analysis_types: list) -> list[VideoAnalysisType]:
+    """解析タイプ名を VideoAnalysisType に変換 (未知の名前は無視)"""
+    return [_ANALYSIS_TYPE_MAP[t] for t in analysis_types if t in _ANALYSIS_TYPE_MAP]
+
+
+def _to_s3_key(video_url: str) -> str:
+    """S3 URL (s3://bucket/key) を bucket/key 形式に変換"""
+    return video_url.removeprefix("s3://")
+
+
+def _decode_frames(frames_base64: list) -> list[bytes]:
+    """Base64 フレームをデコード"""
+    decode = binascii.a2b_base64
+    return [decode(f) for f in frames_base64]
+
+
+def _collect_scenes_and_objects(frames: list) -> tuple[list, list]:
+    """
+    フレーム列からシーン一覧とユニークなオブジェクトを抽出
+    
+    長尺映像ではフレーム数が多いため、1 回の走査で両方を構築する。
+    
+    Returns:
+        tuple: (シーン一覧, 検出オブジェクト一覧)
+    """
+    scenes: list[dict] = []
+    scenes_append = scenes.append
+    # オブジェクト名 → [出現回数, 最大信頼度, 初出時刻]
+    all_objects: dict[str, list] = {}
     
     for frame in frames:
-        for obj in frame.objects:
+        timestamp_ms = frame.timestamp_ms
+        objects = frame.objects
+        scenes_append({
+            "timestamp_ms": timestamp_ms,
+            "description": frame.description,
+            "objects": objects,
+            "confidence": frame.confidence,
+        })
+        for obj in objects:
             obj_name = obj.get("name", obj.get("label", "unknown"))
-            if obj_name not in all_objects:
-                all_objects[obj_name] = {
-                    "name": obj_name,
-                    "first_seen_ms": frame.timestamp_ms,
-                    "confidence": obj.get("confidence", 0.0),
-                    "count": 1,
-                }
-            else:
-                all_objects[obj_name]["count"] += 1
-                all_objects[obj_name]["confidence"] = max(
-                    all_objects[obj_name]["confidence"],
-                    obj.get("confidence", 0.0)
-                )
+            confidence = obj.get("confidence", 0.0)
+            record = all_objects.setdefault(obj_name, [0, confidence, timestamp_ms])
+            record[0] += 1
+            if confidence > record[1]:
+                record[1] = confidence
+    
+    detected_objects = [
+        {
+            "name": name,
+            "first_seen_ms": first_seen_ms,
+            "confidence": confidence,
+            "count": count,
+        }
+        for name, (count, confidence, first_seen_ms) in all_objects.items()
+    ]
     
-    return list(all_objects.values())
+    return scenes, detected_objects
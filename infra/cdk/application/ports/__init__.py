@@ -1,5 +1,5 @@
 """Application Ports (Interfaces)"""
-from .repositories import IAudioRepository, ISessionRepository
+from .repositories import IAudioRepository, ISessionRepository, InvalidCursorError
 from .gateways import (
     ITranscriptionGateway,
     IEmbeddingsGateway,
@@ -11,6 +11,7 @@ from .event_publisher import IEventPublisher
 __all__ = [
     "IAudioRepository",
     "ISessionRepository",
+    "InvalidCursorError",
     "ITranscriptionGateway",
     "IEmbeddingsGateway",
     "IAgentGateway",
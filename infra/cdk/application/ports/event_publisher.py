@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 if TYPE_CHECKING:
     from src.domain.audio.events.audio_events import DomainEvent
@@ -22,7 +22,7 @@ class IEventPublisher(ABC):
         pass
 
     @abstractmethod
-    async def publish_batch(self, events: list["DomainEvent"]) -> None:
+    async def publish_batch(self, events: Sequence["DomainEvent"]) -> None:
         """イベントをバッチ発行"""
         pass
 
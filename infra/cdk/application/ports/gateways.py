@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, BinaryIO
 from uuid import UUID
 
 
@@ -126,10 +126,10 @@ class IStorageGateway(ABC):
     async def upload(
         self,
         key: str,
-        data: bytes,
+        data: bytes | BinaryIO,
         content_type: str = "application/octet-stream",
     ) -> str:
-        """ファイルをアップロード"""
+        """ファイルをアップロード (ファイルオブジェクトはストリーミング転送)"""
         pass
 
     @abstractmethod
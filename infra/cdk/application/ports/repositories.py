@@ -9,6 +9,12 @@ if TYPE_CHECKING:
     from src.domain.audio.entities import AudioFile
 
 
+class InvalidCursorError(Exception):
+    """ページングカーソルが不正（改ざん・破損）"""
+
+    pass
+
+
 class IAudioRepository(ABC):
     """
     Audio Repository Interface
@@ -34,7 +40,12 @@ class IAudioRepository(ABC):
         limit: int = 100,
         cursor: str | None = None,
     ) -> tuple[list[AudioFile], str | None]:
-        """ユーザーIDで音声ファイル一覧を取得（ページネーション対応）"""
+        """
+        ユーザーIDで音声ファイル一覧を取得（ページネーション対応）
+
+        Raises:
+            InvalidCursorError: cursor を解釈できない場合
+        """
         pass
 
     @abstractmethod
@@ -1,7 +1,9 @@
 """Upload Audio Use Case"""
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
+from typing import BinaryIO
 from uuid import UUID
 
 import structlog
@@ -14,6 +16,28 @@ from src.domain.audio.value_objects import AudioMetadata, AudioFormat
 
 logger = structlog.get_logger()
 
+# Content-Type → 音声形式
+_CONTENT_TYPE_MAP: dict[str, AudioFormat] = {
+    "audio/wav": AudioFormat.WAV,
+    "audio/x-wav": AudioFormat.WAV,
+    "audio/mpeg": AudioFormat.MP3,
+    "audio/mp3": AudioFormat.MP3,
+    "audio/flac": AudioFormat.FLAC,
+    "audio/x-flac": AudioFormat.FLAC,
+    "audio/m4a": AudioFormat.M4A,
+    "audio/x-m4a": AudioFormat.M4A,
+    "audio/ogg": AudioFormat.OGG,
+}
+
+# ファイル拡張子 → 音声形式
+_EXT_MAP: dict[str, AudioFormat] = {
+    "wav": AudioFormat.WAV,
+    "mp3": AudioFormat.MP3,
+    "flac": AudioFormat.FLAC,
+    "m4a": AudioFormat.M4A,
+    "ogg": AudioFormat.OGG,
+}
+
 
 class AudioUploadError(Exception):
     """音声アップロードエラー"""
@@ -26,7 +50,7 @@ class UploadAudioInput:
     """アップロード入力DTO"""
 
     user_id: UUID
-    file_data: bytes
+    file_data: bytes | BinaryIO  # ファイルオブジェクトはシーク可能であること
     filename: str
     content_type: str
     duration_seconds: float
@@ -76,6 +100,7 @@ class UploadAudioUseCase:
             audio_format = self._determine_format(input_data.content_type, input_data.filename)
 
             # 2. S3 キーを生成してアップロード
+            file_size_bytes = _payload_size(input_data.file_data)
             s3_key = f"audio/{input_data.user_id}/{input_data.filename}"
             await self._storage.upload(
                 key=s3_key,
@@ -90,7 +115,7 @@ class UploadAudioUseCase:
                 sample_rate=input_data.sample_rate,
                 channels=input_data.channels,
                 format=audio_format,
-                file_size_bytes=len(input_data.file_data),
+                file_size_bytes=file_size_bytes,
             )
 
             # 4. AudioFile 集約を作成
@@ -126,34 +151,21 @@ class UploadAudioUseCase:
 
     def _determine_format(self, content_type: str, filename: str) -> AudioFormat:
         """Content-Type とファイル名から形式を決定"""
-        content_type_map = {
-            "audio/wav": AudioFormat.WAV,
-            "audio/x-wav": AudioFormat.WAV,
-            "audio/mpeg": AudioFormat.MP3,
-            "audio/mp3": AudioFormat.MP3,
-            "audio/flac": AudioFormat.FLAC,
-            "audio/x-flac": AudioFormat.FLAC,
-            "audio/m4a": AudioFormat.M4A,
-            "audio/x-m4a": AudioFormat.M4A,
-            "audio/ogg": AudioFormat.OGG,
-        }
-
-        if content_type in content_type_map:
-            return content_type_map[content_type]
-
-        # ファイル拡張子から判定
-        ext = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
-        ext_map = {
-            "wav": AudioFormat.WAV,
-            "mp3": AudioFormat.MP3,
-            "flac": AudioFormat.FLAC,
-            "m4a": AudioFormat.M4A,
-            "ogg": AudioFormat.OGG,
-        }
-
-        if ext in ext_map:
-            return ext_map[ext]
-
-        # デフォルト
-        return AudioFormat.WAV
+        audio_format = _CONTENT_TYPE_MAP.get(content_type)
+        if audio_format is not None:
+            return audio_format
+
+        # ファイル拡張子から判定 (該当なしはデフォルト WAV)
+        _, dot, ext = filename.rpartition(".")
+        return _EXT_MAP.get(ext.lower() if dot else "", AudioFormat.WAV)
+
+
+def _payload_size(data: bytes | BinaryIO) -> int:
+    """アップロードデータのサイズを取得 (ファイルオブジェクトは読み込まずにシークで計測)"""
+    if isinstance(data, (bytes, bytearray)):
+        return len(data)
 
+    position = data.tell()
+    size = data.seek(0, os.SEEK_END) - position
+    data.seek(position)
+    return size
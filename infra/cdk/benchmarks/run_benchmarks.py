@@ -26,6 +26,7 @@ from src.infrastructure.gateways.bedrock import (
     NovaOmniGateway,
     NovaEmbeddingsGateway,
 )
+from src.infrastructure.gateways.clients import close_aio_clients
 from src.infrastructure.gateways.s3 import S3VectorsGateway
 
 
@@ -159,6 +160,15 @@ async def run_all_benchmarks(
     print(f"Iterations: {iterations}")
     print(f"Timestamp: {datetime.utcnow().isoformat()}")
     
+    try:
+        await _run_benchmarks(region, iterations, output_dir)
+    finally:
+        # asyncio.run がループを閉じる前に共有クライアントの接続を解放
+        await close_aio_clients()
+
+
+async def _run_benchmarks(region: str, iterations: int, output_dir: str) -> None:
+    """各ベンチマークを順に実行して結果を保存"""
     results = []
     
     # Nova Embeddings
@@ -4,7 +4,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any
+from operator import attrgetter
+from typing import Any, Callable
 from uuid import UUID, uuid4
 
 from ..events.audio_events import (
@@ -25,6 +26,37 @@ def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _str_or_none(value: Any) -> str | None:
+    return str(value) if value else None
+
+
+def _to_dict_or_none(value: Any) -> dict[str, Any] | None:
+    return value.to_dict() if value else None
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+# to_dict の (出力キー, 属性名, 変換関数)。呼び出しごとに組み立てず定義時に 1 度だけ構築
+_TO_DICT_ENCODERS: tuple[tuple[str, str, Callable[[Any], Any]], ...] = (
+    ("id", "id", str),
+    ("user_id", "user_id", _str_or_none),
+    ("s3_key", "s3_key", _identity),
+    ("metadata", "metadata", _to_dict_or_none),
+    ("status", "status", attrgetter("value")),
+    ("transcription", "transcription", _to_dict_or_none),
+    ("sentiment", "sentiment", _to_dict_or_none),
+    ("created_at", "created_at", datetime.isoformat),
+    ("updated_at", "updated_at", datetime.isoformat),
+    ("version", "_version", _identity),
+)
+
+
+# 永続化されたイベントデータのうち UUID として復元するキー
+_EVENT_UUID_FIELDS = ("event_id", "audio_id", "user_id")
+
+
 class ProcessingStatus(str, Enum):
     """処理ステータス"""
 
@@ -73,15 +105,14 @@ class AudioFile:
         metadata: AudioMetadata,
     ) -> AudioFile:
         """新しい AudioFile を作成"""
-        audio = cls()
-        audio._apply(
-            AudioCreated(
-                audio_id=uuid4(),
-                user_id=user_id,
-                s3_key=s3_key,
-                metadata=metadata.to_dict(),
-            )
+        # audio_id はイベントの default_factory で採番し、集約の id にも流用する
+        event = AudioCreated(
+            user_id=user_id,
+            s3_key=s3_key,
+            metadata=metadata.to_dict(),
         )
+        audio = cls(id=event.audio_id)
+        audio._apply(event)
         return audio
 
     # === Command Methods ===
@@ -155,24 +186,16 @@ class AudioFile:
 
     def _when(self, event: DomainEvent) -> None:
         """イベントハンドラ（状態遷移）"""
-        handler_name = f"_on_{self._to_snake_case(type(event).__name__)}"
-        handler = getattr(self, handler_name, None)
+        handler = self._EVENT_HANDLERS.get(type(event))
         if handler:
-            handler(event)
-
-    @staticmethod
-    def _to_snake_case(name: str) -> str:
-        """CamelCase → snake_case"""
-        import re
-
-        s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", name)
-        return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+            handler(self, event)
 
     def _on_audio_created(self, event: AudioCreated) -> None:
         self.id = event.audio_id
         self.user_id = event.user_id
         self.s3_key = event.s3_key
-        self.metadata = AudioMetadata.from_dict(event.metadata)
+        # AudioCreated のメタデータは生成時に検証済み
+        self.metadata = AudioMetadata.from_dict_trusted(event.metadata)
         self.status = ProcessingStatus.PENDING
         self.created_at = event.occurred_at
 
@@ -203,6 +226,16 @@ class AudioFile:
         self.status = ProcessingStatus.FAILED
         self.updated_at = event.occurred_at
 
+    # イベント型 → ハンドラのディスパッチテーブル (クラス定義時に 1 度だけ構築)
+    _EVENT_HANDLERS = {
+        AudioCreated: _on_audio_created,
+        AudioProcessingStarted: _on_audio_processing_started,
+        TranscriptionCompleted: _on_transcription_completed,
+        SentimentAnalyzed: _on_sentiment_analyzed,
+        AudioProcessingCompleted: _on_audio_processing_completed,
+        AudioProcessingFailed: _on_audio_processing_failed,
+    }
+
     # === Event Sourcing Helpers ===
 
     @classmethod
@@ -234,11 +267,21 @@ class AudioFile:
         if not event_class:
             raise ValueError(f"Unknown event type: {event_type}")
 
-        return event_class(**event_data)
+        # Event Store の JSON では UUID / datetime が文字列になっているため復元する
+        data = dict(event_data)
+        for key in _EVENT_UUID_FIELDS:
+            value = data.get(key)
+            if isinstance(value, str):
+                data[key] = UUID(value)
+        occurred_at = data.get("occurred_at")
+        if isinstance(occurred_at, str):
+            data["occurred_at"] = datetime.fromisoformat(occurred_at)
 
-    def get_uncommitted_events(self) -> list[DomainEvent]:
-        """未コミットのイベントを取得"""
-        return self._uncommitted_events.copy()
+        return event_class(**data)
+
+    def get_uncommitted_events(self) -> tuple[DomainEvent, ...]:
+        """未コミットのイベントを取得（読み取り専用のスナップショット）"""
+        return tuple(self._uncommitted_events)
 
     def mark_events_as_committed(self) -> None:
         """イベントをコミット済みとしてマーク"""
@@ -254,16 +297,5 @@ class AudioFile:
 
     def to_dict(self) -> dict[str, Any]:
         """辞書に変換"""
-        return {
-            "id": str(self.id),
-            "user_id": str(self.user_id) if self.user_id else None,
-            "s3_key": self.s3_key,
-            "metadata": self.metadata.to_dict() if self.metadata else None,
-            "status": self.status.value,
-            "transcription": self.transcription.to_dict() if self.transcription else None,
-            "sentiment": self.sentiment.to_dict() if self.sentiment else None,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "version": self._version,
-        }
+        return {key: encode(getattr(self, attr)) for key, attr, encode in _TO_DICT_ENCODERS}
 
@@ -1,21 +1,53 @@
 """Audio Domain Events"""
 from __future__ import annotations
 
+import os
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
-from uuid import UUID, uuid4
+from uuid import UUID
+
+# イベントIDの乱数はまとめて os.urandom で取得し、16 バイトずつ切り出す
+# (uuid4() は 1 件ごとに urandom を呼ぶため、イベント生成が多い経路で不利)
+_UUID_POOL_SIZE = 256
+_uuid_lock = threading.Lock()
+_uuid_pool = b""
+_uuid_offset = 0
+
+
+def _reset_uuid_pool() -> None:
+    """fork 後の子プロセスで親と同じ乱数を使わないようプールを破棄"""
+    global _uuid_pool, _uuid_offset
+    _uuid_pool = b""
+    _uuid_offset = 0
+
+
+os.register_at_fork(after_in_child=_reset_uuid_pool)
+
+
+def _uuid4() -> UUID:
+    """プール済み乱数からランダム UUID (version 4) を生成"""
+    global _uuid_pool, _uuid_offset
+    with _uuid_lock:
+        if _uuid_offset >= len(_uuid_pool):
+            _uuid_pool = os.urandom(16 * _UUID_POOL_SIZE)
+            _uuid_offset = 0
+        raw = _uuid_pool[_uuid_offset:_uuid_offset + 16]
+        _uuid_offset += 16
+    # version 指定でバージョン/バリアントのビットは UUID 側で設定される
+    return UUID(bytes=raw, version=4)
 
 
 def _utc_now() -> datetime:
     return datetime.now(timezone.utc)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DomainEvent:
     """ドメインイベント基底クラス"""
 
-    event_id: UUID = field(default_factory=uuid4)
+    event_id: UUID = field(default_factory=_uuid4)
     occurred_at: datetime = field(default_factory=_utc_now)
 
     @property
@@ -23,55 +55,55 @@ class DomainEvent:
         return self.__class__.__name__
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AudioCreated(DomainEvent):
     """音声ファイル作成イベント"""
 
-    audio_id: UUID = field(default_factory=uuid4)
-    user_id: UUID = field(default_factory=uuid4)
+    audio_id: UUID = field(default_factory=_uuid4)
+    user_id: UUID = field(default_factory=_uuid4)
     s3_key: str = ""
     metadata: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AudioProcessingStarted(DomainEvent):
     """音声処理開始イベント"""
 
-    audio_id: UUID = field(default_factory=uuid4)
+    audio_id: UUID = field(default_factory=_uuid4)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TranscriptionCompleted(DomainEvent):
     """文字起こし完了イベント"""
 
-    audio_id: UUID = field(default_factory=uuid4)
+    audio_id: UUID = field(default_factory=_uuid4)
     text: str = ""
     confidence: float = 0.0
     segments: list[dict[str, Any]] = field(default_factory=list)
     language: str = "ja-JP"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class SentimentAnalyzed(DomainEvent):
     """感情分析完了イベント"""
 
-    audio_id: UUID = field(default_factory=uuid4)
+    audio_id: UUID = field(default_factory=_uuid4)
     sentiment: str = ""
     scores: dict[str, float] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AudioProcessingCompleted(DomainEvent):
     """音声処理完了イベント"""
 
-    audio_id: UUID = field(default_factory=uuid4)
+    audio_id: UUID = field(default_factory=_uuid4)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AudioProcessingFailed(DomainEvent):
     """音声処理失敗イベント"""
 
-    audio_id: UUID = field(default_factory=uuid4)
+    audio_id: UUID = field(default_factory=_uuid4)
     reason: str = ""
     error_code: str = ""
 
@@ -1,7 +1,7 @@
 """Audio Value Objects"""
-from .audio_metadata import AudioMetadata
+from .audio_metadata import AudioFormat, AudioMetadata
 from .sentiment_score import SentimentScore
 from .transcript_segment import TranscriptSegment
 
-__all__ = ["AudioMetadata", "SentimentScore", "TranscriptSegment"]
+__all__ = ["AudioFormat", "AudioMetadata", "SentimentScore", "TranscriptSegment"]
 
@@ -17,9 +17,11 @@ class AudioFormat(str, Enum):
 
 
 VALID_SAMPLE_RATES = frozenset([8000, 16000, 22050, 44100, 48000])
+_SORTED_SAMPLE_RATES = tuple(sorted(VALID_SAMPLE_RATES))
+_VALID_CHANNELS = frozenset((1, 2))
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AudioMetadata:
     """
     音声メタデータ（値オブジェクト）
@@ -46,10 +48,10 @@ class AudioMetadata:
         if self.sample_rate not in VALID_SAMPLE_RATES:
             raise ValueError(
                 f"Invalid sample rate: {self.sample_rate}. "
-                f"Must be one of: {sorted(VALID_SAMPLE_RATES)}"
+                f"Must be one of: {list(_SORTED_SAMPLE_RATES)}"
             )
 
-        if self.channels not in (1, 2):
+        if self.channels not in _VALID_CHANNELS:
             raise ValueError(f"Invalid channels: {self.channels}. Must be 1 (mono) or 2 (stereo)")
 
         if self.file_size_bytes < 0:
@@ -96,3 +98,20 @@ class AudioMetadata:
             bitrate=data.get("bitrate", 0),
         )
 
+    @classmethod
+    def from_dict_trusted(cls, data: dict[str, Any]) -> AudioMetadata:
+        """検証済みの辞書から生成（バリデーションを省略）
+
+        Event Store のリプレイ専用。イベントは書き込み時に検証済みのため
+        再検証しない。外部入力には from_dict を使用すること。
+        """
+        obj = object.__new__(cls)
+        set_field = object.__setattr__
+        set_field(obj, "duration_seconds", data["duration_seconds"])
+        set_field(obj, "sample_rate", data["sample_rate"])
+        set_field(obj, "channels", data["channels"])
+        set_field(obj, "format", AudioFormat(data["format"]))
+        set_field(obj, "file_size_bytes", data.get("file_size_bytes", 0))
+        set_field(obj, "bitrate", data.get("bitrate", 0))
+        return obj
+
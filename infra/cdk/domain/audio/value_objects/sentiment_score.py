@@ -48,12 +48,13 @@ class SentimentScore:
     @property
     def dominant(self) -> Sentiment:
         """支配的な感情を取得"""
-        scores = {
-            Sentiment.POSITIVE: self.positive,
-            Sentiment.NEGATIVE: self.negative,
-            Sentiment.NEUTRAL: self.neutral,
-        }
-        return max(scores, key=scores.get)  # type: ignore
+        # 同点時は POSITIVE > NEGATIVE > NEUTRAL の順で優先
+        p, n, u = self.positive, self.negative, self.neutral
+        if p >= n and p >= u:
+            return Sentiment.POSITIVE
+        if n >= u:
+            return Sentiment.NEGATIVE
+        return Sentiment.NEUTRAL
 
     @property
     def dominant_score(self) -> float:
@@ -5,12 +5,14 @@ from dataclasses import dataclass
 from typing import Any
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class TranscriptSegment:
     """
     文字起こしセグメント（値オブジェクト）
 
     音声の一部分に対応する文字起こし結果を表現する。
+    大量に生成されるため、生成時はバリデーションのみを行い
+    (メソッド呼び出しを挟まず __post_init__ で直接検証)、派生値は参照時に計算する。
     """
 
     start_time: float
@@ -21,10 +23,6 @@ class TranscriptSegment:
 
     def __post_init__(self) -> None:
         """バリデーション"""
-        self._validate()
-
-    def _validate(self) -> None:
-        """値の妥当性を検証"""
         if self.start_time < 0:
             raise ValueError(f"start_time must be non-negative, got {self.start_time}")
 
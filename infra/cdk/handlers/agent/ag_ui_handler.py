@@ -17,19 +17,35 @@ AG-UI Protocol Events:
 """
 import os
 import json
-import uuid
+import secrets
 import asyncio
 import logging
 from typing import Any, AsyncGenerator, TypedDict
-from dataclasses import dataclass, asdict
 from enum import Enum
 
+import orjson
+
 # Agent Core インポート
 from src.agent.coordinator import NovaCoordinatorAgent
 
 logger = logging.getLogger(__name__)
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
+# コールドスタート時に 1 度だけ生成するイベントループ (Warm Start 間で再利用)
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
+
+# エージェント結果から応答テキストを取り出すキー (優先順)
+# NovaCoordinatorAgent.process は "response" を返すため通常は先頭で確定する
+_RESPONSE_KEYS = ("response", "message", "content", "text")
+_MISSING = object()
+
+
+def _dumps(value: Any) -> str:
+    """ツール引数 / 結果を JSON 文字列化 (orjson, 非 ASCII はエスケープしない)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 # =============================================================================
 # AG-UI Protocol Types
@@ -51,21 +67,35 @@ class AgUiEventType(str, Enum):
     MESSAGES_SNAPSHOT = "MESSAGES_SNAPSHOT"
 
 
-@dataclass
+# イベント型ごとに不変なフレーム先頭 (b'data: {"type":"RUN_STARTED"')
+_SSE_FRAME_PREFIXES = {
+    event_type: b'data: {"type":' + orjson.dumps(event_type.value)
+    for event_type in AgUiEventType
+}
+_SSE_FRAME_SUFFIX = b"}\n\n"
+
+
 class AgUiEvent:
     """AG-UI Protocol Event"""
+    __slots__ = ('type',)
     type: AgUiEventType
     
-    def to_sse(self) -> str:
-        """Convert to Server-Sent Events format"""
-        data = asdict(self)
-        data['type'] = self.type.value
-        return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+    def __init__(self, type: AgUiEventType):
+        self.type = type
+    
+    def to_sse(self) -> bytes:
+        """
+        Convert to Server-Sent Events format (UTF-8 encoded frame)
+        
+        サブクラスは型ごとのフレーム先頭にフィールドごとの
+        キー断片と orjson.dumps の結果を連結して上書きする。
+        """
+        return _SSE_FRAME_PREFIXES[self.type] + _SSE_FRAME_SUFFIX
 
 
-@dataclass
 class RunStartedEvent(AgUiEvent):
     """RUN_STARTED event"""
+    __slots__ = ("thread_id", "run_id")
     thread_id: str
     run_id: str
     
@@ -73,11 +103,19 @@ class RunStartedEvent(AgUiEvent):
         super().__init__(type=AgUiEventType.RUN_STARTED)
         self.thread_id = thread_id
         self.run_id = run_id
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.RUN_STARTED]
+            + b',"thread_id":' + orjson.dumps(self.thread_id)
+            + b',"run_id":' + orjson.dumps(self.run_id)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass
 class RunFinishedEvent(AgUiEvent):
     """RUN_FINISHED event"""
+    __slots__ = ("thread_id", "run_id")
     thread_id: str
     run_id: str
     
@@ -85,21 +123,36 @@ class RunFinishedEvent(AgUiEvent):
         super().__init__(type=AgUiEventType.RUN_FINISHED)
         self.thread_id = thread_id
         self.run_id = run_id
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.RUN_FINISHED]
+            + b',"thread_id":' + orjson.dumps(self.thread_id)
+            + b',"run_id":' + orjson.dumps(self.run_id)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass
 class RunErrorEvent(AgUiEvent):
     """RUN_ERROR event"""
+    __slots__ = ("error",)
     error: str
     
     def __init__(self, error: str):
         super().__init__(type=AgUiEventType.RUN_ERROR)
         self.error = error
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.RUN_ERROR]
+            + b',"error":' + orjson.dumps(self.error)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass
 class TextMessageStartEvent(AgUiEvent):
     """TEXT_MESSAGE_START event"""
+    __slots__ = ("message_id", "role")
     message_id: str
     role: str
     
@@ -107,11 +160,19 @@ class TextMessageStartEvent(AgUiEvent):
         super().__init__(type=AgUiEventType.TEXT_MESSAGE_START)
         self.message_id = message_id
         self.role = role
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.TEXT_MESSAGE_START]
+            + b',"message_id":' + orjson.dumps(self.message_id)
+            + b',"role":' + orjson.dumps(self.role)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass
 class TextMessageContentEvent(AgUiEvent):
     """TEXT_MESSAGE_CONTENT event"""
+    __slots__ = ("message_id", "delta")
     message_id: str
     delta: str
     
@@ -119,21 +180,36 @@ class TextMessageContentEvent(AgUiEvent):
         super().__init__(type=AgUiEventType.TEXT_MESSAGE_CONTENT)
         self.message_id = message_id
         self.delta = delta
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.TEXT_MESSAGE_CONTENT]
+            + b',"message_id":' + orjson.dumps(self.message_id)
+            + b',"delta":' + orjson.dumps(self.delta)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass
 class TextMessageEndEvent(AgUiEvent):
     """TEXT_MESSAGE_END event"""
+    __slots__ = ("message_id",)
     message_id: str
     
     def __init__(self, message_id: str):
         super().__init__(type=AgUiEventType.TEXT_MESSAGE_END)
         self.message_id = message_id
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.TEXT_MESSAGE_END]
+            + b',"message_id":' + orjson.dumps(self.message_id)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass 
 class ToolCallStartEvent(AgUiEvent):
     """TOOL_CALL_START event"""
+    __slots__ = ("tool_call_id", "tool_name", "parent_message_id")
     tool_call_id: str
     tool_name: str
     parent_message_id: str
@@ -143,11 +219,20 @@ class ToolCallStartEvent(AgUiEvent):
         self.tool_call_id = tool_call_id
         self.tool_name = tool_name
         self.parent_message_id = parent_message_id
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.TOOL_CALL_START]
+            + b',"tool_call_id":' + orjson.dumps(self.tool_call_id)
+            + b',"tool_name":' + orjson.dumps(self.tool_name)
+            + b',"parent_message_id":' + orjson.dumps(self.parent_message_id)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass
 class ToolCallArgsEvent(AgUiEvent):
     """TOOL_CALL_ARGS event"""
+    __slots__ = ("tool_call_id", "delta")
     tool_call_id: str
     delta: str
     
@@ -155,18 +240,34 @@ class ToolCallArgsEvent(AgUiEvent):
         super().__init__(type=AgUiEventType.TOOL_CALL_ARGS)
         self.tool_call_id = tool_call_id
         self.delta = delta
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.TOOL_CALL_ARGS]
+            + b',"tool_call_id":' + orjson.dumps(self.tool_call_id)
+            + b',"delta":' + orjson.dumps(self.delta)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
-@dataclass
 class ToolCallEndEvent(AgUiEvent):
     """TOOL_CALL_END event"""
+    __slots__ = ("tool_call_id", "result")
     tool_call_id: str
-    result: str | None = None
+    result: str | None
     
     def __init__(self, tool_call_id: str, result: str | None = None):
         super().__init__(type=AgUiEventType.TOOL_CALL_END)
         self.tool_call_id = tool_call_id
         self.result = result
+    
+    def to_sse(self) -> bytes:
+        return (
+            _SSE_FRAME_PREFIXES[AgUiEventType.TOOL_CALL_END]
+            + b',"tool_call_id":' + orjson.dumps(self.tool_call_id)
+            + b',"result":' + orjson.dumps(self.result)
+            + _SSE_FRAME_SUFFIX
+        )
 
 
 # =============================================================================
@@ -188,7 +289,7 @@ class AgUiProtocolHandler:
         messages: list[dict[str, Any]],
         thread_id: str,
         run_id: str | None = None,
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
         Handle AG-UI protocol request.
         
@@ -199,12 +300,12 @@ class AgUiProtocolHandler:
             run_id: Optional run identifier
         
         Yields:
-            SSE formatted strings
+            SSE formatted frames (UTF-8 bytes)
         """
         # Generate IDs
         if not run_id:
-            run_id = f"run-{uuid.uuid4().hex[:8]}"
-        message_id = f"msg-{uuid.uuid4().hex[:8]}"
+            run_id = f"run-{secrets.token_hex(4)}"
+        message_id = f"msg-{secrets.token_hex(4)}"
         
         # Extract latest user message
         user_message = self._extract_user_message(messages)
@@ -239,9 +340,12 @@ class AgUiProtocolHandler:
             response_text = self._extract_response(result)
             
             # Check for tool executions
-            if result.get("tool_executions"):
-                for tool_exec in result["tool_executions"]:
-                    tool_call_id = f"tool-{uuid.uuid4().hex[:8]}"
+            tool_executions = result.get("tool_executions")
+            if tool_executions:
+                # ツール呼び出しIDの乱数はまとめて 1 回で取得 (4 バイト = 8 桁の hex)
+                id_bytes = os.urandom(4 * len(tool_executions))
+                for i, tool_exec in enumerate(tool_executions):
+                    tool_call_id = f"tool-{id_bytes[i * 4:i * 4 + 4].hex()}"
                     
                     # Tool call start
                     yield ToolCallStartEvent(
@@ -254,13 +358,13 @@ class AgUiProtocolHandler:
                     if tool_exec.get("arguments"):
                         yield ToolCallArgsEvent(
                             tool_call_id=tool_call_id,
-                            delta=json.dumps(tool_exec["arguments"], ensure_ascii=False),
+                            delta=_dumps(tool_exec["arguments"]),
                         ).to_sse()
                     
                     # Tool call end
                     yield ToolCallEndEvent(
                         tool_call_id=tool_call_id,
-                        result=json.dumps(tool_exec.get("result"), ensure_ascii=False) if tool_exec.get("result") else None,
+                        result=_dumps(tool_exec["result"]) if tool_exec.get("result") else None,
                     ).to_sse()
             
             # Emit TEXT_MESSAGE_CONTENT
@@ -287,7 +391,7 @@ class AgUiProtocolHandler:
             )
             
         except Exception as e:
-            logger.exception(f"AG-UI request error: {e}")
+            logger.exception("AG-UI request error: %s", e)
             yield RunErrorEvent(error=str(e)).to_sse()
     
     def _extract_user_message(self, messages: list[dict[str, Any]]) -> str:
@@ -299,28 +403,22 @@ class AgUiProtocolHandler:
                     return content
                 elif isinstance(content, list):
                     # Handle content array format (multimodal)
-                    parts = []
-                    for item in content:
-                        if isinstance(item, dict):
-                            if item.get("type") == "text":
-                                parts.append(item.get("text", ""))
-                            elif "text" in item:
-                                parts.append(item["text"])
-                    return " ".join(parts)
+                    # text パートのみを 1 パスで連結 (単一要素の join は要素自体を返す)
+                    return " ".join([
+                        item.get("text", "")
+                        for item in content
+                        if isinstance(item, dict) and (item.get("type") == "text" or "text" in item)
+                    ])
         return ""
     
     def _extract_response(self, result: dict[str, Any]) -> str:
         """Extract response text from agent result."""
         if isinstance(result, dict):
-            # Check common response keys
-            if "response" in result:
-                return str(result["response"])
-            if "message" in result:
-                return str(result["message"])
-            if "content" in result:
-                return str(result["content"])
-            if "text" in result:
-                return str(result["text"])
+            # Check common response keys (in priority order)
+            for key in _RESPONSE_KEYS:
+                value = result.get(key, _MISSING)
+                if value is not _MISSING:
+                    return str(value)
         return str(result)
 
 
@@ -344,6 +442,10 @@ def get_handler() -> AgUiProtocolHandler:
                 event_store_table=os.environ.get('EVENT_STORE_TABLE'),
                 model_id=os.environ.get('MODEL_ID', 'anthropic.claude-3-5-sonnet-20240620-v1:0'),
                 guardrail_id=os.environ.get('GUARDRAIL_ID'),
+                guardrail_version=os.environ.get('GUARDRAIL_VERSION', 'DRAFT'),
+                guardrail_region=os.environ.get('GUARDRAIL_REGION'),
+                cache_enabled=os.environ.get('RESPONSE_CACHE_ENABLED', 'false').lower() == 'true',
+                regions=[r for r in os.environ.get('BEDROCK_REGIONS', '').split(',') if r] or None,
             )
         _handler_instance = AgUiProtocolHandler(_agent_instance)
         logger.info("AG-UI Protocol Handler initialized")
@@ -367,17 +469,32 @@ async def ag_ui_stream_generator(
     """
     handler = get_handler()
     
-    async for event_str in handler.handle_request(messages, thread_id, run_id):
-        yield event_str.encode('utf-8')
+    async for frame in handler.handle_request(messages, thread_id, run_id):
+        yield frame
+
+
+def _parse_request(event: dict[str, Any]) -> tuple[list[dict[str, Any]], str, str | None]:
+    """Extract (messages, thread_id, run_id) from the Lambda event body."""
+    body = {}
+    if event.get('body'):
+        body = orjson.loads(event['body']) if isinstance(event['body'], str) else event['body']
+    
+    messages = body.get('messages', [])
+    thread_id = body.get('threadId')
+    if thread_id is None:
+        thread_id = f"thread-{secrets.token_hex(4)}"
+    run_id = body.get('runId')
+    return messages, thread_id, run_id
 
 
 def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """
     Lambda Handler for AG-UI Protocol
     
-    Supports both:
-    1. Standard invocation (returns accumulated response)
-    2. Response Streaming (via Lambda URLs with streaming)
+    全イベントを共有イベントループ上で生成し、SSE 本文としてまとめて返す。
+    マネージド Python ランタイムはハンドラの戻り値を JSON シリアライズするため、
+    async generator を返すレスポンスストリーミングはこのハンドラでは行わない
+    (Function URL の RESPONSE_STREAM でもバッファ済みの本文がそのまま返る)。
     
     Request body format (AG-UI Protocol):
     {
@@ -386,29 +503,25 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         "runId": "run-456"  // optional
     }
     """
-    logger.info(f"AG-UI Lambda received event: {json.dumps(event)[:500]}")
+    # INFO 無効時はイベント全体のシリアライズ自体を省略
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("AG-UI Lambda received event: %s", json.dumps(event)[:500])
     
     try:
-        # Parse body
-        body = {}
-        if event.get('body'):
-            body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
-        
-        messages = body.get('messages', [])
-        thread_id = body.get('threadId', f"thread-{uuid.uuid4().hex[:8]}")
-        run_id = body.get('runId')
+        messages, thread_id, run_id = _parse_request(event)
         
         # Collect all events (non-streaming fallback)
-        async def collect_events():
-            events = []
-            async for event_bytes in ag_ui_stream_generator(messages, thread_id, run_id):
-                events.append(event_bytes.decode('utf-8'))
-            return events
+        async def collect_events() -> bytearray:
+            buffer = bytearray()
+            async for frame in ag_ui_stream_generator(messages, thread_id, run_id):
+                buffer.extend(frame)
+            return buffer
         
-        events = asyncio.get_event_loop().run_until_complete(collect_events())
+        events = _LOOP.run_until_complete(collect_events())
         
         # Return as SSE response
-        sse_body = "".join(events)
+        # API Gateway / Function URL のレスポンス body は str のため最後に 1 回だけデコード
+        sse_body = events.decode('utf-8')
         
         return {
             'statusCode': 200,
@@ -424,8 +537,8 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         }
         
     except Exception as e:
-        logger.exception(f"AG-UI Lambda error: {e}")
-        error_event = RunErrorEvent(error=str(e)).to_sse()
+        logger.exception("AG-UI Lambda error: %s", e)
+        error_event = RunErrorEvent(error=str(e)).to_sse().decode('utf-8')
         
         return {
             'statusCode': 500,
@@ -444,19 +557,15 @@ def lambda_handler_streaming(event: dict[str, Any], context: Any):
     Use with Lambda Function URL with response streaming enabled.
     This handler yields SSE events as they are generated.
     
-    Note: Requires Lambda runtime that supports response streaming
-    (e.g., Python 3.12 with awslambdaric supporting streaming)
+    Note: マネージド Python ランタイムは async generator を返すハンドラに
+    対応していないため、lambda_handler のエントリポイントには使用しない。
+    返却した generator をイベントループ上で反復して逐次送出できる環境
+    (Lambda Web Adapter を AWS_LWA_INVOKE_MODE=response_stream で構成し、
+    ASGI サーバからこの generator を StreamingResponse として返す等) が必要。
     """
     # For Lambda Response Streaming, return an async generator
     # The Lambda runtime will handle streaming automatically
-    
-    body = {}
-    if event.get('body'):
-        body = json.loads(event['body']) if isinstance(event['body'], str) else event['body']
-    
-    messages = body.get('messages', [])
-    thread_id = body.get('threadId', f"thread-{uuid.uuid4().hex[:8]}")
-    run_id = body.get('runId')
+    messages, thread_id, run_id = _parse_request(event)
     
     return ag_ui_stream_generator(messages, thread_id, run_id)
 
@@ -16,6 +16,11 @@ from src.agent.coordinator import NovaCoordinatorAgent
 logger = logging.getLogger(__name__)
 logger.setLevel(os.environ.get("LOG_LEVEL", "INFO"))
 
+# コールドスタート時に 1 度だけ生成するイベントループ (Warm Start 間で再利用)
+# ループごとに保持する aiobotocore クライアントもそのまま再利用される
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
 # グローバル Agent インスタンス (Warm Start 対応)
 _agent_instance: NovaCoordinatorAgent | None = None
 
@@ -31,6 +36,10 @@ def get_agent() -> NovaCoordinatorAgent:
             event_store_table=os.environ.get('EVENT_STORE_TABLE'),
             model_id=os.environ.get('MODEL_ID', 'anthropic.claude-3-5-sonnet-20240620-v1:0'),
             guardrail_id=os.environ.get('GUARDRAIL_ID'),
+            guardrail_version=os.environ.get('GUARDRAIL_VERSION', 'DRAFT'),
+            guardrail_region=os.environ.get('GUARDRAIL_REGION'),
+            cache_enabled=os.environ.get('RESPONSE_CACHE_ENABLED', 'false').lower() == 'true',
+            regions=[r for r in os.environ.get('BEDROCK_REGIONS', '').split(',') if r] or None,
         )
         logger.info("Agent Core initialized successfully")
     
@@ -47,7 +56,9 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     - GET /agent/sessions/{id} - セッション取得
     - DELETE /agent/sessions/{id} - セッション削除
     """
-    logger.info(f"Received event: {json.dumps(event)}")
+    # INFO 無効時はイベント全体のシリアライズ自体を省略
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received event: %s", json.dumps(event))
     
     try:
         # HTTP メソッドとパスを取得
@@ -78,7 +89,7 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
         return _handle_chat(agent, body, context)
         
     except Exception as e:
-        logger.exception(f"Error processing request: {e}")
+        logger.exception("Error processing request: %s", e)
         return {
             'statusCode': 500,
             'body': json.dumps({'error': str(e), 'message': 'Internal server error'}),
@@ -100,7 +111,7 @@ def _handle_chat(agent: NovaCoordinatorAgent, body: dict, context: Any) -> dict[
         }
     
     # 非同期処理を同期的に実行
-    result = asyncio.get_event_loop().run_until_complete(
+    result = _LOOP.run_until_complete(
         agent.process(
             user_input=user_input,
             session_id=session_id,
@@ -119,7 +130,7 @@ def _handle_create_session(agent: NovaCoordinatorAgent, body: dict) -> dict[str,
     """セッション作成"""
     user_id = body.get('user_id')
     
-    session_id = asyncio.get_event_loop().run_until_complete(
+    session_id = _LOOP.run_until_complete(
         agent.create_session(user_id=user_id)
     )
     
@@ -132,7 +143,7 @@ def _handle_create_session(agent: NovaCoordinatorAgent, body: dict) -> dict[str,
 
 def _handle_get_session(agent: NovaCoordinatorAgent, session_id: str) -> dict[str, Any]:
     """セッション取得"""
-    session = asyncio.get_event_loop().run_until_complete(
+    session = _LOOP.run_until_complete(
         agent.get_session(session_id)
     )
     
@@ -152,7 +163,7 @@ def _handle_get_session(agent: NovaCoordinatorAgent, session_id: str) -> dict[st
 
 def _handle_delete_session(agent: NovaCoordinatorAgent, session_id: str) -> dict[str, Any]:
     """セッション削除"""
-    asyncio.get_event_loop().run_until_complete(
+    _LOOP.run_until_complete(
         agent.delete_session(session_id)
     )
     
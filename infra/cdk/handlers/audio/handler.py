@@ -20,8 +20,6 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-import boto3
-
 from src.agent.tools.audio import (
     transcribe_audio,
     analyze_audio,
@@ -30,6 +28,7 @@ from src.agent.tools.audio import (
     TranscriptionResult,
     AudioAnalysisResult,
 )
+from src.infrastructure.gateways.clients import get_client, get_resource
 
 logger = logging.getLogger()
 logger.setLevel(os.environ.get('LOG_LEVEL', 'INFO'))
@@ -39,8 +38,14 @@ CONTENT_BUCKET = os.environ.get('CONTENT_BUCKET', '')
 EVENT_STORE_TABLE = os.environ.get('EVENT_STORE_TABLE', 'nova-event-store')
 CACHE_TABLE = os.environ.get('CACHE_TABLE', '')  # オプション: 結果キャッシュ用
 
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+# 接続プールを拡張した共有クライアント (Warm Start 間で再利用)
+s3 = get_client('s3')
+dynamodb = get_resource('dynamodb')
+
+# コールドスタート時に 1 度だけ生成するイベントループ (Warm Start 間で再利用)
+# ループごとに保持する aiobotocore クライアントもそのまま再利用される
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
 
 
 def lambda_handler(event: dict, context: Any) -> dict:
@@ -111,21 +116,14 @@ def handle_transcribe(body: dict, request_id: str) -> dict:
     if not audio_url:
         return response(400, {'error': 'audio_url is required'})
     
-    # 非同期処理を同期的に実行
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    try:
-        result = loop.run_until_complete(
-            transcribe_audio(
-                audio_url=audio_url,
-                language=language,
-                enable_speaker_diarization=enable_speaker_diarization,
-                max_speakers=max_speakers,
-            )
+    result = _LOOP.run_until_complete(
+        transcribe_audio(
+            audio_url=audio_url,
+            language=language,
+            enable_speaker_diarization=enable_speaker_diarization,
+            max_speakers=max_speakers,
         )
-    finally:
-        loop.close()
+    )
     
     # Event Store に保存
     store_event('AudioTranscribed', {
@@ -164,19 +162,13 @@ def handle_analyze(body: dict, request_id: str) -> dict:
     if not audio_url:
         return response(400, {'error': 'audio_url is required'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    try:
-        result = loop.run_until_complete(
-            analyze_audio(
-                audio_url=audio_url,
-                analysis_types=analysis_types,
-                detect_noise=detect_noise,
-            )
+    result = _LOOP.run_until_complete(
+        analyze_audio(
+            audio_url=audio_url,
+            analysis_types=analysis_types,
+            detect_noise=detect_noise,
         )
-    finally:
-        loop.close()
+    )
     
     # Event Store に保存
     store_event('AudioAnalyzed', {
@@ -210,15 +202,9 @@ def handle_quality_check(body: dict, request_id: str) -> dict:
     if not audio_url:
         return response(400, {'error': 'audio_url is required'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    
-    try:
-        result = loop.run_until_complete(
-            detect_speech_quality(audio_url=audio_url)
-        )
-    finally:
-        loop.close()
+    result = _LOOP.run_until_complete(
+        detect_speech_quality(audio_url=audio_url)
+    )
     
     result['request_id'] = request_id
     
@@ -247,21 +233,15 @@ def handle_batch_transcribe(body: dict, request_id: str) -> dict:
     if len(audio_urls) > 10:
         return response(400, {'error': 'Maximum 10 audio files per batch'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    # 並列処理
+    async def process_batch():
+        tasks = [
+            transcribe_audio(audio_url=url, language=language)
+            for url in audio_urls
+        ]
+        return await asyncio.gather(*tasks, return_exceptions=True)
     
-    try:
-        # 並列処理
-        async def process_batch():
-            tasks = [
-                transcribe_audio(audio_url=url, language=language)
-                for url in audio_urls
-            ]
-            return await asyncio.gather(*tasks, return_exceptions=True)
-        
-        results = loop.run_until_complete(process_batch())
-    finally:
-        loop.close()
+    results = _LOOP.run_until_complete(process_batch())
     
     # 結果を構造化
     batch_results = []
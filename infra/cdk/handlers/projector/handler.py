@@ -5,12 +5,14 @@ DynamoDB Streams を使用した CQRS Read Model 更新:
 - Event Store からの変更を検知
 - Read Model (クエリ最適化ビュー) を更新
 """
+import hashlib
 import json
 import os
 import logging
 from typing import Any
 
 import boto3
+import orjson
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -19,6 +21,75 @@ logger.setLevel(logging.INFO)
 READ_MODEL_TABLE = os.environ.get('READ_MODEL_TABLE', 'nova-read-model')
 
 dynamodb = boto3.resource('dynamodb')
+# Table ハンドルはコールドスタート時に 1 度だけ生成して再利用
+read_model_table = dynamodb.Table(READ_MODEL_TABLE)
+
+# 統計カウンタ属性 → UpdateExpression
+_INCREMENT_EXPRESSIONS = {
+    'search_count': 'ADD search_count :inc',
+    'indexed_count': 'ADD indexed_count :inc',
+}
+
+
+def _url_key(url: str) -> str:
+    """URL から Read Model のパーティションキー用ハッシュを生成
+
+    組み込みの hash() はプロセスごとにランダム化されるため使用しない。
+    """
+    return hashlib.blake2b(url.encode(), digest_size=8).hexdigest()
+
+
+class ProjectionBatch:
+    """
+    1 回の呼び出し分の Read Model 書き込みをまとめるバッファ
+
+    - put: BatchWriteItem (25 件 / リクエスト) でまとめて書き込み
+    - 統計カウンタ: 同じ (pk, sk, 属性) の加算を合算して UpdateItem 1 回にする
+    """
+
+    def __init__(self) -> None:
+        self.items: list[dict[str, Any]] = []
+        self.increments: dict[tuple[str, str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items) + len(self.increments)
+
+    def put(self, item: dict[str, Any]) -> None:
+        self.items.append(item)
+
+    def increment(self, pk: str, sk: str, attribute: str, amount: int = 1) -> None:
+        key = (pk, sk, attribute)
+        self.increments[key] = self.increments.get(key, 0) + amount
+
+    def flush(self) -> None:
+        """バッファ内容を Read Model に書き込む"""
+        table = read_model_table
+
+        if self.items:
+            # batch_writer が 25 件単位の分割と UnprocessedItems の再送を行う
+            # 同一キーの重複は後勝ちでまとめる (同一バッチ内の重複キーはエラーになるため)
+            with table.batch_writer(overwrite_by_pkeys=['pk', 'sk']) as writer:
+                for item in self.items:
+                    writer.put_item(Item=item)
+
+        # カウンタは低レベルクライアントで型付き AttributeValue を直接渡す
+        # (resource 層の Python 型 → AttributeValue 変換を省略)
+        client = dynamodb.meta.client
+        for (pk, sk, attribute), amount in self.increments.items():
+            client.update_item(
+                TableName=READ_MODEL_TABLE,
+                Key={
+                    'pk': {'S': pk},
+                    'sk': {'S': sk},
+                },
+                UpdateExpression=_INCREMENT_EXPRESSIONS[attribute],
+                ExpressionAttributeValues={
+                    ':inc': {'N': str(amount)},
+                },
+            )
+
+        self.items.clear()
+        self.increments.clear()
 
 
 def lambda_handler(event: dict, context: Any) -> dict:
@@ -33,17 +104,26 @@ def lambda_handler(event: dict, context: Any) -> dict:
     
     processed = 0
     errors = 0
+    batch = ProjectionBatch()
     
     for record in event.get('Records', []):
         try:
             if record['eventName'] in ['INSERT', 'MODIFY']:
                 new_image = record['dynamodb'].get('NewImage', {})
-                process_event(new_image)
+                process_event(new_image, batch)
                 processed += 1
         except Exception as e:
             logger.exception(f"Error processing record: {e}")
             errors += 1
     
+    # 全レコードの射影をまとめて書き込み
+    pending = len(batch)
+    try:
+        batch.flush()
+    except Exception as e:
+        logger.exception(f"Error writing read model: {e}")
+        errors += pending
+    
     logger.info(f"Processed: {processed}, Errors: {errors}")
     
     return {
@@ -55,42 +135,42 @@ def lambda_handler(event: dict, context: Any) -> dict:
     }
 
 
-def process_event(new_image: dict) -> None:
-    """イベントを処理して Read Model を更新"""
-    # DynamoDB Streams の AttributeValue 形式をパース
-    pk = new_image.get('pk', {}).get('S', '')
-    event_type = new_image.get('event_type', {}).get('S', '')
-    data_str = new_image.get('data', {}).get('S', '{}')
-    timestamp = new_image.get('timestamp', {}).get('S', '')
-    
+def _string_attr(image: dict, name: str, default: str = '') -> str:
+    """AttributeValue 形式のイメージから文字列 (S) 属性を取得"""
+    try:
+        return image[name]['S']
+    except KeyError:
+        return default
+
+
+def process_event(new_image: dict, batch: ProjectionBatch) -> None:
+    """イベントを処理して Read Model の更新をバッファに追加"""
+    # DynamoDB Streams の AttributeValue 形式から必要な文字列属性だけを取り出す
+    # (イメージ全体を TypeDeserializer で変換するより軽い)
+    pk = _string_attr(new_image, 'pk')
     if not pk.startswith('EVENT#'):
         return
     
-    data = json.loads(data_str)
+    event_type = _string_attr(new_image, 'event_type')
     
     # イベントタイプ別の処理
-    if event_type == 'AudioTranscribed':
-        project_audio_transcription(data, timestamp)
-    elif event_type == 'AudioAnalyzed':
-        project_audio_analysis(data, timestamp)
-    elif event_type == 'VideoAnalyzed':
-        project_video_analysis(data, timestamp)
-    elif event_type == 'SearchPerformed':
-        project_search_stats(data, timestamp)
-    elif event_type == 'DocumentIndexed':
-        project_document_stats(data, timestamp)
-    else:
-        logger.debug(f"Unknown event type: {event_type}")
-
-
-def project_audio_transcription(data: dict, timestamp: str) -> None:
-    """音声文字起こし Read Model 更新"""
-    table = dynamodb.Table(READ_MODEL_TABLE)
+    entry = _PROJECTORS.get(event_type)
+    if entry is None:
+        logger.debug("Unknown event type: %s", event_type)
+        return
     
+    projector, needs_data = entry
+    # 統計系の射影はペイロードを使わないため data のパースを省略
+    data = orjson.loads(_string_attr(new_image, 'data', '{}')) if needs_data else {}
+    projector(data, _string_attr(new_image, 'timestamp'), batch)
+
+
+def project_audio_transcription(data: dict, timestamp: str, batch: ProjectionBatch) -> None:
+    """音声文字起こし Read Model 更新"""
     audio_url = data.get('audio_url', '')
     
-    table.put_item(Item={
-        'pk': f"AUDIO#{hash(audio_url) % 1000000}",
+    batch.put({
+        'pk': f"AUDIO#{_url_key(audio_url)}",
         'sk': f"TRANSCRIPTION#{timestamp}",
         'audio_url': audio_url,
         'text': data.get('text', ''),
@@ -100,14 +180,12 @@ def project_audio_transcription(data: dict, timestamp: str) -> None:
     })
 
 
-def project_audio_analysis(data: dict, timestamp: str) -> None:
+def project_audio_analysis(data: dict, timestamp: str, batch: ProjectionBatch) -> None:
     """音声分析 Read Model 更新"""
-    table = dynamodb.Table(READ_MODEL_TABLE)
-    
     audio_url = data.get('audio_url', '')
     
-    table.put_item(Item={
-        'pk': f"AUDIO#{hash(audio_url) % 1000000}",
+    batch.put({
+        'pk': f"AUDIO#{_url_key(audio_url)}",
         'sk': f"ANALYSIS#{timestamp}",
         'audio_url': audio_url,
         'sentiment': data.get('sentiment', ''),
@@ -117,14 +195,12 @@ def project_audio_analysis(data: dict, timestamp: str) -> None:
     })
 
 
-def project_video_analysis(data: dict, timestamp: str) -> None:
+def project_video_analysis(data: dict, timestamp: str, batch: ProjectionBatch) -> None:
     """映像分析 Read Model 更新"""
-    table = dynamodb.Table(READ_MODEL_TABLE)
-    
     video_url = data.get('video_url', '')
     
-    table.put_item(Item={
-        'pk': f"VIDEO#{hash(video_url) % 1000000}",
+    batch.put({
+        'pk': f"VIDEO#{_url_key(video_url)}",
         'sk': f"ANALYSIS#{timestamp}",
         'video_url': video_url,
         'summary': data.get('summary', ''),
@@ -136,38 +212,26 @@ def project_video_analysis(data: dict, timestamp: str) -> None:
     })
 
 
-def project_search_stats(data: dict, timestamp: str) -> None:
+def project_search_stats(data: dict, timestamp: str, batch: ProjectionBatch) -> None:
     """検索統計 Read Model 更新"""
-    table = dynamodb.Table(READ_MODEL_TABLE)
-    
     # 日次検索統計を更新
     date_key = timestamp[:10]  # YYYY-MM-DD
     
-    table.update_item(
-        Key={
-            'pk': 'STATS#SEARCH',
-            'sk': f"DAILY#{date_key}",
-        },
-        UpdateExpression='ADD search_count :inc',
-        ExpressionAttributeValues={
-            ':inc': 1,
-        },
-    )
-
-
-def project_document_stats(data: dict, timestamp: str) -> None:
+    batch.increment('STATS#SEARCH', f"DAILY#{date_key}", 'search_count')
+
+
+def project_document_stats(data: dict, timestamp: str, batch: ProjectionBatch) -> None:
     """ドキュメント統計 Read Model 更新"""
-    table = dynamodb.Table(READ_MODEL_TABLE)
-    
     date_key = timestamp[:10]
     
-    table.update_item(
-        Key={
-            'pk': 'STATS#DOCUMENT',
-            'sk': f"DAILY#{date_key}",
-        },
-        UpdateExpression='ADD indexed_count :inc',
-        ExpressionAttributeValues={
-            ':inc': 1,
-        },
-    )
+    batch.increment('STATS#DOCUMENT', f"DAILY#{date_key}", 'indexed_count')
+
+
+# イベントタイプ → (射影関数, data ペイロードを使うか)
+_PROJECTORS = {
+    'AudioTranscribed': (project_audio_transcription, True),
+    'AudioAnalyzed': (project_audio_analysis, True),
+    'VideoAnalyzed': (project_video_analysis, True),
+    'SearchPerformed': (project_search_stats, False),
+    'DocumentIndexed': (project_document_stats, False),
+}
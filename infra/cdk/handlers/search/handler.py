@@ -6,24 +6,26 @@ Nova Embeddings + S3 Vectors を使用:
 - ベクトル類似検索
 - Knowledge Base 統合
 """
-import json
 import os
 import logging
 import asyncio
-from typing import Any
+import uuid
+from datetime import datetime
+from typing import Any, Coroutine
 
-import boto3
+import orjson
 
 from src.agent.tools.search import (
     search_knowledge,
     generate_embeddings,
     generate_batch_embeddings,
-    compute_similarity,
+    compute_similarity_sync,
     create_vector_index,
     put_vectors,
     query_vectors,
     hybrid_search,
 )
+from src.infrastructure.gateways.clients import get_client, get_resource
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -33,17 +35,36 @@ CONTENT_BUCKET = os.environ.get('CONTENT_BUCKET', '')
 VECTOR_INDEX = os.environ.get('VECTOR_INDEX', 'nova-vector-index')
 EVENT_STORE_TABLE = os.environ.get('EVENT_STORE_TABLE', 'nova-event-store')
 
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+# 接続プールを拡張した共有クライアント (Warm Start 間で再利用)
+s3 = get_client('s3')
+dynamodb = get_resource('dynamodb')
+# Table ハンドルはコールドスタート時に 1 度だけ生成して再利用
+event_store_table = dynamodb.Table(EVENT_STORE_TABLE)
+
+# コールドスタート時に 1 度だけ生成するイベントループ (Warm Start 間で再利用)
+# ループごとに保持する aiobotocore クライアントもそのまま再利用される
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
+
+
+def _dumps(value: Any) -> str:
+    """JSON 文字列に変換 (埋め込みなど float 配列を多く含むため orjson を使用)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _run(coro: Coroutine[Any, Any, dict]) -> dict:
+    """共有イベントループ上でコルーチンを実行"""
+    return _LOOP.run_until_complete(coro)
 
 
 def lambda_handler(event: dict, context: Any) -> dict:
     """Lambda エントリポイント"""
-    logger.info(f"Event: {json.dumps(event)}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Event: %s", _dumps(event))
     
     http_method = event.get('httpMethod', 'POST')
     path = event.get('path', '')
-    body = json.loads(event.get('body', '{}')) if event.get('body') else {}
+    body = orjson.loads(event['body']) if event.get('body') else {}
     
     try:
         if path == '/search' and http_method == 'POST':
@@ -83,19 +104,14 @@ def handle_search(body: dict) -> dict:
     if not query and not query_image_url:
         return response(400, {'error': 'Either query or query_image_url is required'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            search_knowledge(
-                query=query,
-                query_image_url=query_image_url,
-                top_k=top_k,
-                filters=filters,
-            )
+    result = _run(
+        search_knowledge(
+            query=query,
+            query_image_url=query_image_url,
+            top_k=top_k,
+            filters=filters,
         )
-    finally:
-        loop.close()
+    )
     
     # Event Store に保存
     if 'error' not in result:
@@ -122,14 +138,9 @@ def handle_embeddings(body: dict) -> dict:
     if dimension not in [256, 384, 1024]:
         return response(400, {'error': 'dimension must be 256, 384, or 1024'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            generate_embeddings(text=text, image_url=image_url, dimension=dimension)
-        )
-    finally:
-        loop.close()
+    result = _run(
+        generate_embeddings(text=text, image_url=image_url, dimension=dimension)
+    )
     
     return response(200, result)
 
@@ -148,14 +159,9 @@ def handle_batch_embeddings(body: dict) -> dict:
     if dimension not in [256, 384, 1024]:
         return response(400, {'error': 'dimension must be 256, 384, or 1024'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            generate_batch_embeddings(texts=texts, dimension=dimension)
-        )
-    finally:
-        loop.close()
+    result = _run(
+        generate_batch_embeddings(texts=texts, dimension=dimension)
+    )
     
     # Event Store に保存
     store_event('BatchEmbeddingsGenerated', {
@@ -181,14 +187,8 @@ def handle_similarity(body: dict) -> dict:
     if len(embedding1) != len(embedding2):
         return response(400, {'error': 'embeddings must have the same dimension'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            compute_similarity(embedding1=embedding1, embedding2=embedding2)
-        )
-    finally:
-        loop.close()
+    # 計算のみで I/O を伴わないため、イベントループを介さず同期で実行
+    result = compute_similarity_sync(embedding1=embedding1, embedding2=embedding2)
     
     return response(200, result)
 
@@ -208,30 +208,27 @@ def handle_index_document(body: dict) -> dict:
         return response(400, {'error': 'Either text or image_url is required'})
     
     # 埋め込みベクトルを生成
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        embedding_result = loop.run_until_complete(
-            generate_embeddings(text=text, image_url=image_url, dimension=dimension)
-        )
-    finally:
-        loop.close()
+    embedding_result = _run(
+        generate_embeddings(text=text, image_url=image_url, dimension=dimension)
+    )
     
     # S3 Vectors にインデックス (GA後に実装)
     # 現在はメタデータを DynamoDB に保存
-    store_document_metadata(document_id, {
-        'text': text,
-        'image_url': image_url,
-        'embedding_dimension': embedding_result.get('dimension'),
-        'modality': embedding_result.get('modality'),
-        **metadata,
-    })
-    
-    store_event('DocumentIndexed', {
-        'document_id': document_id,
-        'modality': embedding_result.get('modality'),
-        'dimension': embedding_result.get('dimension'),
-    })
+    # メタデータとイベントを 1 回のリクエストで書き込み
+    write_items([
+        document_metadata_item(document_id, {
+            'text': text,
+            'image_url': image_url,
+            'embedding_dimension': embedding_result.get('dimension'),
+            'modality': embedding_result.get('modality'),
+            **metadata,
+        }),
+        event_item('DocumentIndexed', {
+            'document_id': document_id,
+            'modality': embedding_result.get('modality'),
+            'dimension': embedding_result.get('dimension'),
+        }),
+    ])
     
     return response(201, {
         'document_id': document_id,
@@ -243,41 +240,59 @@ def handle_index_document(body: dict) -> dict:
 
 def store_document_metadata(document_id: str, metadata: dict) -> None:
     """ドキュメントメタデータを保存"""
-    from datetime import datetime
-    
-    table = dynamodb.Table(EVENT_STORE_TABLE)
+    write_items([document_metadata_item(document_id, metadata)])
+
+
+def store_event(event_type: str, data: dict) -> None:
+    """Event Store にイベントを保存"""
+    write_items([event_item(event_type, data)])
+
+
+def document_metadata_item(document_id: str, metadata: dict) -> dict:
+    """ドキュメントメタデータの DynamoDB アイテムを生成"""
     timestamp = datetime.utcnow().isoformat()
     
-    table.put_item(Item={
+    return {
         'pk': f"DOCUMENT#{document_id}",
         'sk': 'METADATA',
         'document_id': document_id,
-        'metadata': json.dumps(metadata),
+        'metadata': _dumps(metadata),
         'indexed_at': timestamp,
         'gsi1pk': 'DOCUMENT',
         'gsi1sk': timestamp,
-    })
+    }
 
 
-def store_event(event_type: str, data: dict) -> None:
-    """Event Store にイベントを保存"""
-    import uuid
-    from datetime import datetime
-    
-    table = dynamodb.Table(EVENT_STORE_TABLE)
+def event_item(event_type: str, data: dict) -> dict:
+    """Event Store のイベントアイテムを生成"""
     event_id = str(uuid.uuid4())
     timestamp = datetime.utcnow().isoformat()
     
-    table.put_item(Item={
+    return {
         'pk': f"EVENT#{event_type}",
         'sk': f"{timestamp}#{event_id}",
         'event_id': event_id,
         'event_type': event_type,
-        'data': json.dumps(data),
+        'data': _dumps(data),
         'timestamp': timestamp,
         'gsi1pk': event_type,
         'gsi1sk': timestamp,
-    })
+    }
+
+
+def write_items(items: list[dict]) -> None:
+    """
+    Event Store テーブルにアイテムを書き込む
+    
+    複数アイテムは BatchWriteItem 1 回にまとめる (未処理分は batch_writer が再送)。
+    """
+    if len(items) == 1:
+        event_store_table.put_item(Item=items[0])
+        return
+    
+    with event_store_table.batch_writer() as writer:
+        for item in items:
+            writer.put_item(Item=item)
 
 
 # ========== S3 Vectors Handlers ==========
@@ -292,19 +307,14 @@ def handle_create_vector_index(body: dict) -> dict:
     if not bucket_name or not index_name:
         return response(400, {'error': 'bucket_name and index_name are required'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            create_vector_index(
-                bucket_name=bucket_name,
-                index_name=index_name,
-                dimension=dimension,
-                distance_metric=distance_metric,
-            )
+    result = _run(
+        create_vector_index(
+            bucket_name=bucket_name,
+            index_name=index_name,
+            dimension=dimension,
+            distance_metric=distance_metric,
         )
-    finally:
-        loop.close()
+    )
     
     store_event('VectorIndexCreated', {
         'bucket_name': bucket_name,
@@ -327,18 +337,13 @@ def handle_put_vectors(body: dict) -> dict:
     if not isinstance(vectors, list):
         return response(400, {'error': 'vectors must be an array'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            put_vectors(
-                bucket_name=bucket_name,
-                index_name=index_name,
-                vectors=vectors,
-            )
+    result = _run(
+        put_vectors(
+            bucket_name=bucket_name,
+            index_name=index_name,
+            vectors=vectors,
         )
-    finally:
-        loop.close()
+    )
     
     store_event('VectorsPut', {
         'bucket_name': bucket_name,
@@ -361,20 +366,15 @@ def handle_query_vectors(body: dict) -> dict:
     if not bucket_name or not index_name or not query_vector:
         return response(400, {'error': 'bucket_name, index_name, and query_vector are required'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            query_vectors(
-                bucket_name=bucket_name,
-                index_name=index_name,
-                query_vector=query_vector,
-                top_k=top_k,
-                filter_expression=filter_expression,
-            )
+    result = _run(
+        query_vectors(
+            bucket_name=bucket_name,
+            index_name=index_name,
+            query_vector=query_vector,
+            top_k=top_k,
+            filter_expression=filter_expression,
         )
-    finally:
-        loop.close()
+    )
     
     return response(200, result)
 
@@ -391,21 +391,16 @@ def handle_hybrid_search(body: dict) -> dict:
     if not bucket_name or not index_name or not query_vector:
         return response(400, {'error': 'bucket_name, index_name, and query_vector are required'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            hybrid_search(
-                bucket_name=bucket_name,
-                index_name=index_name,
-                query_vector=query_vector,
-                text_query=text_query,
-                top_k=top_k,
-                vector_weight=vector_weight,
-            )
+    result = _run(
+        hybrid_search(
+            bucket_name=bucket_name,
+            index_name=index_name,
+            query_vector=query_vector,
+            text_query=text_query,
+            top_k=top_k,
+            vector_weight=vector_weight,
         )
-    finally:
-        loop.close()
+    )
     
     return response(200, result)
 
@@ -418,5 +413,5 @@ def response(status_code: int, body: dict) -> dict:
             'Content-Type': 'application/json',
             'Access-Control-Allow-Origin': '*',
         },
-        'body': json.dumps(body) if body else '',
+        'body': _dumps(body) if body else '',
     }
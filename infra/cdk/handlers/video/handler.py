@@ -13,13 +13,12 @@ import logging
 import asyncio
 from typing import Any
 
-import boto3
-
 from src.agent.tools.video import (
     analyze_video,
     detect_video_anomalies,
     analyze_video_frames,
 )
+from src.infrastructure.gateways.clients import get_client, get_resource
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
@@ -28,8 +27,14 @@ logger.setLevel(logging.INFO)
 CONTENT_BUCKET = os.environ.get('CONTENT_BUCKET', '')
 EVENT_STORE_TABLE = os.environ.get('EVENT_STORE_TABLE', 'nova-event-store')
 
-s3 = boto3.client('s3')
-dynamodb = boto3.resource('dynamodb')
+# 接続プールを拡張した共有クライアント (Warm Start 間で再利用)
+s3 = get_client('s3')
+dynamodb = get_resource('dynamodb')
+
+# コールドスタート時に 1 度だけ生成するイベントループ (Warm Start 間で再利用)
+# ループごとに保持する aiobotocore クライアントもそのまま再利用される
+_LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(_LOOP)
 
 
 def lambda_handler(event: dict, context: Any) -> dict:
@@ -66,19 +71,13 @@ def handle_analyze(body: dict) -> dict:
     if not video_url:
         return response(400, {'error': 'video_url is required'})
     
-    # 非同期関数を実行
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            analyze_video(
-                video_url=video_url,
-                analysis_types=analysis_types,
-                temporal_analysis=temporal_analysis,
-            )
+    result = _LOOP.run_until_complete(
+        analyze_video(
+            video_url=video_url,
+            analysis_types=analysis_types,
+            temporal_analysis=temporal_analysis,
         )
-    finally:
-        loop.close()
+    )
     
     # Event Store に保存
     if 'error' not in result:
@@ -103,18 +102,13 @@ def handle_anomaly_detection(body: dict) -> dict:
     if not video_url:
         return response(400, {'error': 'video_url is required'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            detect_video_anomalies(
-                video_url=video_url,
-                baseline_description=baseline_description,
-                sensitivity=sensitivity,
-            )
+    result = _LOOP.run_until_complete(
+        detect_video_anomalies(
+            video_url=video_url,
+            baseline_description=baseline_description,
+            sensitivity=sensitivity,
         )
-    finally:
-        loop.close()
+    )
     
     # 異常検出時はイベント保存
     if result.get('anomaly_count', 0) > 0:
@@ -138,17 +132,12 @@ def handle_frame_analysis(body: dict) -> dict:
     if len(frames_base64) > 20:
         return response(400, {'error': 'Maximum 20 frames allowed'})
     
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        result = loop.run_until_complete(
-            analyze_video_frames(
-                frames_base64=frames_base64,
-                analysis_types=analysis_types,
-            )
+    result = _LOOP.run_until_complete(
+        analyze_video_frames(
+            frames_base64=frames_base64,
+            analysis_types=analysis_types,
         )
-    finally:
-        loop.close()
+    )
     
     return response(200, result)
 
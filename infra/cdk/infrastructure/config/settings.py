@@ -1,7 +1,7 @@
 """Application Settings"""
 from functools import lru_cache
 
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -50,10 +50,16 @@ class Settings(BaseSettings):
     knowledge_base_id: str = ""
     guardrail_id: str = ""
 
-    class Config:
-        env_prefix = "NOVA_"
-        env_file = ".env"
-        case_sensitive = False
+    # プロセス内で共有するため生成後は変更不可にする。
+    # デフォルト値はリテラルで型が確定しているため検証を省略 (環境変数由来の値は検証する)
+    model_config = SettingsConfigDict(
+        env_prefix="NOVA_",
+        env_file=".env",
+        case_sensitive=False,
+        frozen=True,
+        validate_default=False,
+        extra="ignore",
+    )
 
     @property
     def is_production(self) -> bool:
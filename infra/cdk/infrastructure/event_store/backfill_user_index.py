@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+GSI2 (ユーザー別一覧) バックフィル
+
+GSI2 導入前に書き込まれた AudioCreated イベントに gsi2pk / gsi2sk を付与し、
+DynamoDBAudioRepository.find_by_user の一覧に表示されるようにする。
+GSI2 を参照するコードのデプロイ直後に 1 度実行する (再実行しても安全)。
+
+使用方法:
+    python -m src.infrastructure.event_store.backfill_user_index --table nova-event-store
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from src.infrastructure.event_store.dynamodb_event_store import DynamoDBEventStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill GSI2 attributes on existing events")
+    parser.add_argument("--table", default="nova-event-store", help="Event Store table name")
+    parser.add_argument("--region", default="us-east-1", help="AWS region")
+    parser.add_argument("--event-type", default="AudioCreated", help="Event type to backfill")
+
+    args = parser.parse_args()
+
+    event_store = DynamoDBEventStore(table_name=args.table, region=args.region)
+    updated = asyncio.run(event_store.backfill_user_index(args.event_type))
+    print(f"Backfilled {updated} item(s) in {args.table}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 """DynamoDB Event Store Implementation"""
 from __future__ import annotations
 
-import json
+import asyncio
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Sequence
 from uuid import UUID
 
-import boto3
 from boto3.dynamodb.conditions import Key
+import orjson
 import structlog
 
+from src.infrastructure.gateways.clients import get_resource
+
 logger = structlog.get_logger()
 
 
@@ -32,14 +34,14 @@ class DynamoDBEventStore:
         region: str = "us-east-1",
     ):
         self.table_name = table_name
-        self._dynamodb = boto3.resource("dynamodb", region_name=region)
+        self._dynamodb = get_resource("dynamodb", region)
         self._table = self._dynamodb.Table(table_name)
 
     async def append_events(
         self,
         aggregate_type: str,
         aggregate_id: UUID,
-        events: list[Any],
+        events: Sequence[Any],
         expected_version: int,
     ) -> None:
         """
@@ -110,7 +112,9 @@ class DynamoDBEventStore:
 
         pk = f"{aggregate_type}#{aggregate_id}"
 
-        response = self._table.query(
+        # 複数集約の並行取得 (asyncio.gather) に対応するため、同期 API はスレッドで実行
+        response = await asyncio.to_thread(
+            self._table.query,
             KeyConditionExpression=Key("pk").eq(pk)
             & Key("sk").gte(f"v{from_version:010d}"),
         )
@@ -150,6 +154,93 @@ class DynamoDBEventStore:
 
         return [self._deserialize_event(item) for item in response["Items"]]
 
+    async def get_events_by_user(
+        self,
+        user_id: UUID,
+        limit: int = 100,
+        exclusive_start_key: dict[str, Any] | None = None,
+    ) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+        """
+        ユーザーIDで検索（GSI2使用）
+
+        user_id を持つイベント（集約の作成イベント）のみが GSI2 に登録される。
+
+        Args:
+            user_id: ユーザーID
+            limit: 最大件数
+            exclusive_start_key: 前回の LastEvaluatedKey（ページング）
+
+        Returns:
+            (イベントのリスト, 次ページの開始キー)
+        """
+        params: dict[str, Any] = {
+            "IndexName": "gsi2",
+            "KeyConditionExpression": Key("gsi2pk").eq(f"USER#{user_id}"),
+            "Limit": limit,
+        }
+        if exclusive_start_key:
+            params["ExclusiveStartKey"] = exclusive_start_key
+
+        response = await asyncio.to_thread(self._table.query, **params)
+
+        events = [self._deserialize_event(item) for item in response["Items"]]
+        return events, response.get("LastEvaluatedKey")
+
+    async def backfill_user_index(self, event_type: str = "AudioCreated") -> int:
+        """
+        GSI2 属性を持たない既存イベントに gsi2pk / gsi2sk を付与（移行用）
+
+        GSI2 導入前に書き込まれたイベントはユーザー別一覧に現れないため、
+        GSI1 (イベントタイプ別) を走査して event_data の user_id から設定する。
+        既に GSI2 属性を持つアイテムは条件付き更新でスキップするため、再実行できる。
+
+        Args:
+            event_type: 対象のイベントタイプ
+
+        Returns:
+            更新したアイテム数
+        """
+        return await asyncio.to_thread(self._backfill_user_index, event_type)
+
+    def _backfill_user_index(self, event_type: str) -> int:
+        """backfill_user_index の同期処理"""
+        log = logger.bind(event_type=event_type)
+        params: dict[str, Any] = {
+            "IndexName": "gsi1",
+            "KeyConditionExpression": Key("gsi1pk").eq(event_type),
+        }
+        updated = 0
+
+        while True:
+            response = self._table.query(**params)
+            for item in response["Items"]:
+                if "gsi2pk" in item:
+                    continue
+                user_id = orjson.loads(item["event_data"]).get("user_id")
+                if user_id is None:
+                    continue
+                try:
+                    self._table.update_item(
+                        Key={"pk": item["pk"], "sk": item["sk"]},
+                        UpdateExpression="SET gsi2pk = :pk, gsi2sk = :sk",
+                        ConditionExpression="attribute_not_exists(gsi2pk)",
+                        ExpressionAttributeValues={
+                            ":pk": f"USER#{user_id}",
+                            ":sk": f"{item['occurred_at']}#{item['aggregate_id']}",
+                        },
+                    )
+                except self._table.meta.client.exceptions.ConditionalCheckFailedException:
+                    continue
+                updated += 1
+
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            params["ExclusiveStartKey"] = last_key
+
+        log.info("user_index_backfilled", updated=updated)
+        return updated
+
     async def _get_current_version(
         self,
         aggregate_type: str,
@@ -180,32 +271,32 @@ class DynamoDBEventStore:
         event_id = getattr(event, "event_id", None)
         occurred_at = getattr(event, "occurred_at", datetime.now(timezone.utc))
 
-        # イベントデータを抽出
-        event_data = {}
-        for key, value in event.__dict__.items():
-            if key.startswith("_"):
-                continue
-            if isinstance(value, UUID):
-                event_data[key] = str(value)
-            elif isinstance(value, datetime):
-                event_data[key] = value.isoformat()
-            else:
-                event_data[key] = value
+        # イベント (dataclass) を orjson で直接シリアライズ
+        # UUID / datetime も orjson が C 実装で文字列化するため中間 dict は作らない
+        event_data = orjson.dumps(event).decode()
 
-        return {
+        item = {
             "pk": f"{aggregate_type}#{aggregate_id}",
             "sk": f"v{version:010d}",
             "event_id": str(event_id) if event_id else None,
             "aggregate_type": aggregate_type,
             "aggregate_id": str(aggregate_id),
             "event_type": type(event).__name__,
-            "event_data": json.dumps(event_data),
+            "event_data": event_data,
             "version": version,
             "occurred_at": occurred_at.isoformat(),
             "gsi1pk": type(event).__name__,
             "gsi1sk": occurred_at.isoformat(),
         }
 
+        # user_id を持つイベント (集約の作成イベント) はユーザー別一覧用の GSI2 にも登録
+        user_id = getattr(event, "user_id", None)
+        if user_id is not None:
+            item["gsi2pk"] = f"USER#{user_id}"
+            item["gsi2sk"] = f"{occurred_at.isoformat()}#{aggregate_id}"
+
+        return item
+
     def _deserialize_event(self, item: dict[str, Any]) -> dict[str, Any]:
         """DynamoDBアイテムをイベントにデシリアライズ"""
         return {
@@ -213,7 +304,7 @@ class DynamoDBEventStore:
             "aggregate_type": item["aggregate_type"],
             "aggregate_id": UUID(item["aggregate_id"]),
             "event_type": item["event_type"],
-            "event_data": json.loads(item["event_data"]),
+            "event_data": orjson.loads(item["event_data"]),
             "version": item["version"],
             "occurred_at": datetime.fromisoformat(item["occurred_at"]),
         }
@@ -1,15 +1,19 @@
 """Nova Embeddings Gateway Implementation"""
 from __future__ import annotations
 
+import asyncio
 import base64
-import json
+import math
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Optional
 
-import boto3
+import numpy as np
+import orjson
 import structlog
 
+from src.infrastructure.gateways.clients import get_aio_client, get_client
+
 logger = structlog.get_logger()
 
 
@@ -27,10 +31,10 @@ class EmbeddingDimension(int, Enum):
     DIM_1024 = 1024
 
 
-@dataclass
+@dataclass(slots=True)
 class EmbeddingResult:
     """埋め込みベクトル結果"""
-    embedding: list[float]
+    embedding: np.ndarray  # float32, shape=(dimension,)
     dimension: int
     modality: InputModality
     input_token_count: int
@@ -67,6 +71,8 @@ class NovaEmbeddingsGateway:
     MAX_TEXT_LENGTH = 2048
     MAX_IMAGE_SIZE_BYTES = 5 * 1024 * 1024  # 5MB
     MAX_BATCH_SIZE = 32
+    # バッチ生成時の同時リクエスト数 (非同期クライアントのためスレッド数に制限されない)
+    MAX_BATCH_CONCURRENCY = 16
 
     def __init__(
         self,
@@ -75,8 +81,24 @@ class NovaEmbeddingsGateway:
     ):
         self.region = region
         self.model_id = model_id
-        self._client = boto3.client("bedrock-runtime", region_name=region)
-        self._s3_client = boto3.client("s3", region_name=region)
+        self._s3_client = get_client("s3", region)
+
+    async def _invoke(self, request_body: dict[str, Any]) -> dict[str, Any]:
+        """
+        Bedrock を呼び出してレスポンス本文をパース
+        
+        aioboto3 の非同期クライアントで呼び出すため、バッチ生成時も
+        スレッドプールのサイズに制限されずにリクエストを並行して送信できる。
+        """
+        client = await get_aio_client("bedrock-runtime", self.region)
+        response = await client.invoke_model(
+            modelId=self.model_id,
+            body=orjson.dumps(request_body),
+            contentType="application/json",
+        )
+
+        async with response["body"] as stream:
+            return orjson.loads(await stream.read())
 
     async def generate_text_embedding(
         self,
@@ -110,14 +132,8 @@ class NovaEmbeddingsGateway:
                 },
             }
 
-            response = self._client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType="application/json",
-            )
-
-            result = json.loads(response["body"].read())
-            embedding = result.get("embedding", [])
+            result = await self._invoke(request_body)
+            embedding = np.asarray(result.get("embedding", []), dtype=np.float32)
             
             if normalize:
                 embedding = self._normalize(embedding)
@@ -183,14 +199,8 @@ class NovaEmbeddingsGateway:
                 },
             }
 
-            response = self._client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType="application/json",
-            )
-
-            result = json.loads(response["body"].read())
-            embedding = result.get("embedding", [])
+            result = await self._invoke(request_body)
+            embedding = np.asarray(result.get("embedding", []), dtype=np.float32)
             
             if normalize:
                 embedding = self._normalize(embedding)
@@ -259,14 +269,8 @@ class NovaEmbeddingsGateway:
                 },
             }
 
-            response = self._client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType="application/json",
-            )
-
-            result = json.loads(response["body"].read())
-            embedding = result.get("embedding", [])
+            result = await self._invoke(request_body)
+            embedding = np.asarray(result.get("embedding", []), dtype=np.float32)
             
             if normalize:
                 embedding = self._normalize(embedding)
@@ -308,26 +312,37 @@ class NovaEmbeddingsGateway:
         if len(texts) > self.MAX_BATCH_SIZE:
             raise ValueError(f"Batch size exceeds maximum of {self.MAX_BATCH_SIZE}")
 
+        semaphore = asyncio.Semaphore(self.MAX_BATCH_CONCURRENCY)
+
+        async def embed(index: int, text: str) -> EmbeddingResult | None:
+            async with semaphore:
+                try:
+                    return await self.generate_text_embedding(text, output_dimension, normalize)
+                except Exception as e:
+                    log.warning("batch_item_failed", index=index, error=str(e))
+                    return None
+
+        # 各テキストを並行してリクエスト (レイテンシは合計ではなく最大値に近づく)
+        results = await asyncio.gather(*(embed(i, text) for i, text in enumerate(texts)))
+
         embeddings = []
         total_tokens = 0
         error_count = 0
 
-        for i, text in enumerate(texts):
-            try:
-                result = await self.generate_text_embedding(text, output_dimension, normalize)
-                embeddings.append(result)
-                total_tokens += result.input_token_count
-            except Exception as e:
-                log.warning("batch_item_failed", index=i, error=str(e))
+        for result in results:
+            if result is None:
                 error_count += 1
                 # エラーの場合はゼロベクトルを追加
                 embeddings.append(EmbeddingResult(
-                    embedding=[0.0] * output_dimension.value,
+                    embedding=np.zeros(output_dimension.value, dtype=np.float32),
                     dimension=output_dimension.value,
                     modality=InputModality.TEXT,
                     input_token_count=0,
                     model_id=self.model_id,
                 ))
+            else:
+                embeddings.append(result)
+                total_tokens += result.input_token_count
 
         log.info("batch_embedding_completed", 
                  success_count=len(embeddings) - error_count,
@@ -340,14 +355,17 @@ class NovaEmbeddingsGateway:
             error_count=error_count,
         )
 
+    @staticmethod
     def compute_similarity(
-        self,
         embedding1: list[float],
         embedding2: list[float],
     ) -> float:
         """
         2つの埋め込みベクトルのコサイン類似度を計算
         
+        内積・ノルムは NumPy (BLAS) で計算する。API 呼び出しを伴わないため
+        インスタンス (Bedrock クライアント) なしでも呼び出せる。
+        
         Args:
             embedding1: ベクトル1
             embedding2: ベクトル2
@@ -355,24 +373,55 @@ class NovaEmbeddingsGateway:
         Returns:
             float: コサイン類似度 (-1 to 1)
         """
-        if len(embedding1) != len(embedding2):
+        a = np.asarray(embedding1, dtype=np.float32)
+        b = np.asarray(embedding2, dtype=np.float32)
+        if a.shape != b.shape:
             raise ValueError("Embedding dimensions must match")
 
-        dot_product = sum(a * b for a, b in zip(embedding1, embedding2))
-        norm1 = sum(a * a for a in embedding1) ** 0.5
-        norm2 = sum(b * b for b in embedding2) ** 0.5
-
-        if norm1 == 0 or norm2 == 0:
+        # np.linalg.norm は汎用処理のオーバーヘッドが大きいため、
+        # ノルムも内積 (BLAS sdot) 3 回で計算する
+        norm_sq = float(a @ a) * float(b @ b)
+        if norm_sq == 0:
             return 0.0
 
-        return dot_product / (norm1 * norm2)
+        return float(a @ b) / math.sqrt(norm_sq)
+
+    @staticmethod
+    def compute_similarities(
+        query: list[float],
+        candidates: list[list[float]],
+    ) -> list[float]:
+        """
+        クエリと複数ベクトルのコサイン類似度を一括計算
+        
+        候補を行列にまとめ、行列・ベクトル積 1 回で計算する。
+        
+        Args:
+            query: クエリベクトル
+            candidates: 候補ベクトルのリスト
+            
+        Returns:
+            list[float]: 候補ごとのコサイン類似度
+        """
+        if len(candidates) == 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32)
+        m = np.asarray(candidates, dtype=np.float32)
+        if m.ndim != 2 or m.shape[1] != q.shape[0]:
+            raise ValueError("Embedding dimensions must match")
+
+        norms = np.sqrt(np.einsum("ij,ij->i", m, m) * float(q @ q))
+        dots = m @ q
+        sims = np.divide(dots, norms, out=np.zeros_like(dots), where=norms != 0)
+        return sims.tolist()
 
-    def _normalize(self, embedding: list[float]) -> list[float]:
+    def _normalize(self, embedding: np.ndarray) -> np.ndarray:
         """L2正規化"""
-        norm = sum(x * x for x in embedding) ** 0.5
+        norm = math.sqrt(float(embedding @ embedding))
         if norm == 0:
             return embedding
-        return [x / norm for x in embedding]
+        return embedding / np.float32(norm)
 
 
 
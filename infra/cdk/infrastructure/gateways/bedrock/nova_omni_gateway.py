@@ -7,11 +7,16 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Any
 
-import boto3
 import structlog
 
+from src.infrastructure.gateways.clients import get_aio_client, get_client
+
 logger = structlog.get_logger()
 
+# レイテンシ最適化推論が未対応だった (model_id, region) の組
+# ゲートウェイのインスタンス設定は変更せず、未対応の組だけ standard で呼び出す
+_LATENCY_OPTIMIZED_UNSUPPORTED: set[tuple[str, str]] = set()
+
 
 class VideoAnalysisType(str, Enum):
     """映像解析タイプ"""
@@ -59,11 +64,55 @@ class NovaOmniGateway:
         self,
         region: str = "us-east-1",
         model_id: str = "amazon.nova-pro-v1:0",  # Nova Pro for vision
+        performance_latency: str = "standard",  # standard / optimized
     ):
         self.region = region
         self.model_id = model_id
-        self._client = boto3.client("bedrock-runtime", region_name=region)
-        self._s3_client = boto3.client("s3", region_name=region)
+        self.performance_latency = performance_latency
+        self._s3_client = get_client("s3", region)
+
+    async def _invoke(self, request_body: dict[str, Any]) -> dict[str, Any]:
+        """
+        Bedrock を呼び出してレスポンス本文をパース
+        
+        aioboto3 の非同期クライアントで呼び出すため、スレッドを消費せずに
+        1 つのイベントループから複数の解析リクエストを並行して処理できる。
+        レイテンシ最適化推論 (performanceConfigLatency=optimized) が
+        モデル / リージョンで未対応の場合は standard で再試行し、以後その
+        モデル / リージョンの組に限って standard で呼び出す。
+        """
+        client = await get_aio_client("bedrock-runtime", self.region)
+        body = json.dumps(request_body)
+        target = (self.model_id, self.region)
+        latency = self.performance_latency
+        if target in _LATENCY_OPTIMIZED_UNSUPPORTED:
+            latency = "standard"
+        try:
+            response = await client.invoke_model(
+                modelId=self.model_id,
+                body=body,
+                contentType="application/json",
+                performanceConfigLatency=latency,
+            )
+        except client.exceptions.ValidationException as e:
+            if latency == "standard" or "latency" not in str(e).lower():
+                raise
+            logger.warning(
+                "latency_optimized_unsupported",
+                model_id=self.model_id,
+                region=self.region,
+                error=str(e),
+            )
+            _LATENCY_OPTIMIZED_UNSUPPORTED.add(target)
+            response = await client.invoke_model(
+                modelId=self.model_id,
+                body=body,
+                contentType="application/json",
+                performanceConfigLatency="standard",
+            )
+
+        async with response["body"] as stream:
+            return json.loads(await stream.read())
 
     async def analyze_video(
         self,
@@ -130,13 +179,7 @@ class NovaOmniGateway:
             }
 
             # Bedrock 呼び出し
-            response = self._client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType="application/json",
-            )
-
-            result = json.loads(response["body"].read())
+            result = await self._invoke(request_body)
             log.info("video_analysis_completed")
 
             return self._parse_response(result, analysis_types)
@@ -194,13 +237,7 @@ class NovaOmniGateway:
                 },
             }
 
-            response = self._client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType="application/json",
-            )
-
-            result = json.loads(response["body"].read())
+            result = await self._invoke(request_body)
             log.info("frame_analysis_completed")
 
             return self._parse_response(result, analysis_types)
@@ -272,13 +309,7 @@ Output as JSON array.""",
                 },
             }
 
-            response = self._client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body),
-                contentType="application/json",
-            )
-
-            result = json.loads(response["body"].read())
+            result = await self._invoke(request_body)
             
             # レスポンスから異常リストを抽出
             content = result.get("output", {}).get("message", {}).get("content", [])
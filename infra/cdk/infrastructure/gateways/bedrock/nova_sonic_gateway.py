@@ -1,16 +1,37 @@
 """Nova Sonic Gateway Implementation"""
 from __future__ import annotations
 
-import json
+import asyncio
+import base64
+import io
 from typing import Any
 
-import boto3
+from boto3.s3.transfer import TransferConfig
+import orjson
 import structlog
 
 from src.application.ports.gateways import ITranscriptionGateway, TranscriptionResult
+from src.infrastructure.gateways.clients import get_client
 
 logger = structlog.get_logger()
 
+# 音声ダウンロード設定 (8MB を超えるファイルはレンジ GET を並行実行)
+DOWNLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+# ファイル拡張子 → Nova Sonic の音声形式
+_AUDIO_FORMATS = {
+    "wav": "wav",
+    "mp3": "mp3",
+    "flac": "flac",
+    "m4a": "m4a",
+    "ogg": "ogg",
+}
+
 
 class NovaSonicGateway(ITranscriptionGateway):
     """
@@ -26,8 +47,8 @@ class NovaSonicGateway(ITranscriptionGateway):
     ):
         self.region = region
         self.model_id = model_id
-        self._client = boto3.client("bedrock-runtime", region_name=region)
-        self._s3_client = boto3.client("s3", region_name=region)
+        self._client = get_client("bedrock-runtime", region)
+        self._s3_client = get_client("s3", region)
 
     async def transcribe(
         self,
@@ -54,14 +75,21 @@ class NovaSonicGateway(ITranscriptionGateway):
             bucket = s3_key.split("/")[0] if "/" in s3_key else "nova-content"
             key = "/".join(s3_key.split("/")[1:]) if "/" in s3_key else s3_key
 
-            response = self._s3_client.get_object(Bucket=bucket, Key=key)
-            audio_data = response["Body"].read()
+            buffer = io.BytesIO()
+            await asyncio.to_thread(
+                self._s3_client.download_fileobj,
+                bucket,
+                key,
+                buffer,
+                Config=DOWNLOAD_TRANSFER_CONFIG,
+            )
 
             # Nova Sonic リクエストを構築
             request_body = {
                 "audio": {
                     "format": self._detect_format(s3_key),
-                    "source": {"bytes": audio_data},
+                    # JSON ボディのためバイト列は Base64 で 1 度だけエンコード
+                    "source": {"bytes": self._encode_audio(buffer.getbuffer())},
                 },
                 "audioOutputConfig": {
                     "encoding": "pcm",
@@ -81,14 +109,18 @@ class NovaSonicGateway(ITranscriptionGateway):
                     "maxSpeakers": 5,
                 }
 
+            # ダウンロードバッファは Base64 化後に不要なため先に解放
+            buffer.close()
+
             # Bedrock 呼び出し
-            response = self._client.invoke_model(
+            response = await asyncio.to_thread(
+                self._client.invoke_model,
                 modelId=self.model_id,
-                body=json.dumps(request_body),
+                body=orjson.dumps(request_body),
                 contentType="application/json",
             )
 
-            result = json.loads(response["body"].read())
+            result = orjson.loads(response["body"].read())
             log.info("transcription_completed", confidence=result.get("confidence", 0))
 
             return self._parse_response(result, language)
@@ -119,7 +151,7 @@ class NovaSonicGateway(ITranscriptionGateway):
             request_body = {
                 "audio": {
                     "format": "pcm",
-                    "source": {"bytes": audio_stream},
+                    "source": {"bytes": self._encode_audio(audio_stream)},
                 },
                 "audioOutputConfig": {
                     "encoding": "pcm",
@@ -133,13 +165,14 @@ class NovaSonicGateway(ITranscriptionGateway):
                 },
             }
 
-            response = self._client.invoke_model(
+            response = await asyncio.to_thread(
+                self._client.invoke_model,
                 modelId=self.model_id,
-                body=json.dumps(request_body),
+                body=orjson.dumps(request_body),
                 contentType="application/json",
             )
 
-            result = json.loads(response["body"].read())
+            result = orjson.loads(response["body"].read())
             log.info("stream_transcription_completed")
 
             return self._parse_response(result, language)
@@ -148,17 +181,17 @@ class NovaSonicGateway(ITranscriptionGateway):
             log.error("stream_transcription_failed", error=str(e))
             raise
 
+    @staticmethod
+    def _encode_audio(audio: bytes | memoryview) -> str:
+        """音声バイト列を JSON リクエスト用の Base64 文字列に変換"""
+        return base64.b64encode(audio).decode("ascii")
+
     def _detect_format(self, s3_key: str) -> str:
         """ファイル拡張子から形式を検出"""
-        ext = s3_key.rsplit(".", 1)[-1].lower() if "." in s3_key else "wav"
-        format_map = {
-            "wav": "wav",
-            "mp3": "mp3",
-            "flac": "flac",
-            "m4a": "m4a",
-            "ogg": "ogg",
-        }
-        return format_map.get(ext, "wav")
+        dot = s3_key.rfind(".")
+        if dot < 0:
+            return "wav"
+        return _AUDIO_FORMATS.get(s3_key[dot + 1:].lower(), "wav")
 
     def _parse_response(
         self, result: dict[str, Any], language: str
@@ -0,0 +1,121 @@
+"""Shared AWS Clients
+
+Agent / Gateway / Lambda ハンドラから使用する AWS クライアントを共有:
+- 同期 (boto3) と非同期 (aioboto3) のアクセサをこのモジュールに集約し、
+  接続プール・keep-alive・タイムアウト・リトライ設定を 1 か所で管理
+- 同期クライアントはサービス・リージョンごとにプロセス内で 1 度だけ生成
+- 非同期クライアントはイベントループに紐づくため、ループごとに保持し
+  ループ単位の AsyncExitStack で開く (close_aio_clients() でまとめて閉じる)
+- 接続プールを拡張し、並行リクエスト時のプール枯渇・再接続 (TLS ハンドシェイク) を回避
+- スロットリング / ServiceUnavailable は botocore の adaptive リトライ
+  (トークンバケットによるクライアント側レート制御) に任せる
+"""
+from __future__ import annotations
+
+import asyncio
+import weakref
+from contextlib import AsyncExitStack
+from functools import lru_cache
+from typing import Any, Optional
+
+import aioboto3
+import boto3
+from aiobotocore.config import AioConfig
+from botocore.config import Config
+
+# 同期・非同期クライアント共通の設定
+_CLIENT_SETTINGS: dict[str, Any] = {
+    "max_pool_connections": 64,
+    "connect_timeout": 3,
+    "read_timeout": 60,
+    "retries": {"mode": "adaptive", "max_attempts": 5},
+}
+
+CLIENT_CONFIG = Config(tcp_keepalive=True, **_CLIENT_SETTINGS)
+
+AIO_CLIENT_CONFIG = AioConfig(
+    connector_args={"keepalive_timeout": 60},
+    **_CLIENT_SETTINGS,
+)
+
+_SESSION = boto3.session.Session()
+_AIO_SESSION = aioboto3.Session()
+
+# loop -> (クライアントを開いた AsyncExitStack, (service, region) -> client)
+_aio_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, tuple[AsyncExitStack, dict[tuple[str, Optional[str]], Any]]
+] = weakref.WeakKeyDictionary()
+
+
+@lru_cache()
+def get_client(service_name: str, region_name: Optional[str] = None) -> Any:
+    """
+    共有クライアントを取得
+
+    Args:
+        service_name: サービス名（例: "s3", "bedrock-runtime"）
+        region_name: リージョン (None の場合はデフォルトリージョン)
+
+    Returns:
+        botocore クライアント（プロセス内で再利用）
+    """
+    return _SESSION.client(service_name, region_name=region_name, config=CLIENT_CONFIG)
+
+
+@lru_cache()
+def get_resource(service_name: str, region_name: Optional[str] = None) -> Any:
+    """
+    共有 Resource を取得
+
+    Args:
+        service_name: サービス名（例: "dynamodb"）
+        region_name: リージョン (None の場合はデフォルトリージョン)
+    """
+    return _SESSION.resource(service_name, region_name=region_name, config=CLIENT_CONFIG)
+
+
+async def get_aio_client(service_name: str, region_name: Optional[str] = None) -> Any:
+    """
+    共有の非同期クライアントを取得
+
+    Lambda ハンドラのようにプロセス寿命のイベントループで使う前提。
+    ループを閉じる場合は事前に close_aio_clients() を await すること。
+
+    Args:
+        service_name: サービス名（例: "s3", "bedrock-runtime"）
+        region_name: リージョン (None の場合はデフォルトリージョン)
+
+    Returns:
+        aiobotocore クライアント（現在のイベントループで再利用）
+    """
+    loop = asyncio.get_running_loop()
+    entry = _aio_clients.get(loop)
+    if entry is None:
+        entry = _aio_clients[loop] = (AsyncExitStack(), {})
+    stack, clients = entry
+
+    key = (service_name, region_name)
+    client = clients.get(key)
+    if client is None:
+        client = await stack.enter_async_context(
+            _AIO_SESSION.client(
+                service_name,
+                region_name=region_name,
+                config=AIO_CLIENT_CONFIG,
+            )
+        )
+        clients[key] = client
+
+    return client
+
+
+async def close_aio_clients() -> None:
+    """
+    現在のイベントループに紐づく共有クライアントを閉じる
+
+    aiohttp セッション・コネクタを解放するため、ループを閉じる前
+    (asyncio.run に渡すコルーチンの終了時など) に呼び出す。
+    """
+    entry = _aio_clients.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[0].aclose()
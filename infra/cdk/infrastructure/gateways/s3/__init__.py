@@ -8,6 +8,7 @@ from src.infrastructure.gateways.s3.s3_vectors_gateway import (
     VectorRecord,
     QueryResult,
     QueryResponse,
+    quantize_vector,
 )
 
 __all__ = [
@@ -19,4 +20,5 @@ __all__ = [
     "VectorRecord",
     "QueryResult",
     "QueryResponse",
+    "quantize_vector",
 ]
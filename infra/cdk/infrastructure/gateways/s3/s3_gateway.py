@@ -1,14 +1,24 @@
 """S3 Gateway Implementation"""
 from __future__ import annotations
 
-import boto3
+from typing import BinaryIO
+
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 import structlog
 
 from src.application.ports.gateways import IStorageGateway
+from src.infrastructure.gateways.clients import get_aio_client, get_client
 
 logger = structlog.get_logger()
 
+# ストリーミングアップロード設定 (8MB パートのマルチパート転送、メモリ使用量はパート単位)
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    use_threads=True,
+)
+
 
 class S3Gateway(IStorageGateway):
     """
@@ -24,12 +34,12 @@ class S3Gateway(IStorageGateway):
     ):
         self.bucket_name = bucket_name
         self.region = region
-        self._client = boto3.client("s3", region_name=region)
+        self._client = get_client("s3", region)
 
     async def upload(
         self,
         key: str,
-        data: bytes,
+        data: bytes | BinaryIO,
         content_type: str = "application/octet-stream",
     ) -> str:
         """
@@ -37,22 +47,35 @@ class S3Gateway(IStorageGateway):
 
         Args:
             key: S3オブジェクトキー
-            data: ファイルデータ
+            data: ファイルデータ、またはファイルオブジェクト
+                (ファイルオブジェクトは全体をメモリに載せずマルチパートで転送)
             content_type: Content-Type
 
         Returns:
             str: S3 URI
         """
         log = logger.bind(bucket=self.bucket_name, key=key)
-        log.info("upload_started", size=len(data))
 
         try:
-            self._client.put_object(
-                Bucket=self.bucket_name,
-                Key=key,
-                Body=data,
-                ContentType=content_type,
-            )
+            # 非同期クライアントでイベントループ上から直接送信 (スレッドを占有しない)
+            client = await get_aio_client("s3", self.region)
+            if isinstance(data, (bytes, bytearray)):
+                log.info("upload_started", size=len(data))
+                await client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Body=data,
+                    ContentType=content_type,
+                )
+            else:
+                log.info("upload_started", streaming=True)
+                await client.upload_fileobj(
+                    Fileobj=data,
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    ExtraArgs={"ContentType": content_type},
+                    Config=UPLOAD_TRANSFER_CONFIG,
+                )
 
             uri = f"s3://{self.bucket_name}/{key}"
             log.info("upload_completed", uri=uri)
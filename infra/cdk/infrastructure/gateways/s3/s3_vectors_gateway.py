@@ -1,16 +1,53 @@
 """S3 Vectors Gateway Implementation"""
 from __future__ import annotations
 
+import asyncio
 import json
 from dataclasses import dataclass
 from enum import Enum
 from typing import Any, Optional
 
-import boto3
+import numpy as np
 import structlog
 
+from src.infrastructure.gateways.clients import get_client
+
 logger = structlog.get_logger()
 
+# 送信精度ごとの丸め桁数 (小数点以下)
+# S3 Vectors はベクトルを float32 で保存するため、バイト列での送信はできない。
+# 正規化済み埋め込み (|x| < 1) の量子化刻みに合わせて値を丸め、
+# JSON 上の数値表現 (1 要素 ~20 文字) を短くしてリクエストサイズを削減する。
+#   fp16: 仮数部 11bit 相当 (~1e-5)
+#   int8: 最大値 / 127 相当 (~1e-3)
+VECTOR_PRECISION_DECIMALS: dict[str, Optional[int]] = {
+    "fp32": None,
+    "fp16": 5,
+    "int8": 3,
+}
+
+
+def quantize_vector(vector: list[float], precision: str = "fp32") -> list[float]:
+    """
+    送信用にベクトルの精度を落とす
+    
+    Args:
+        vector: ベクトル
+        precision: 送信精度 (fp32, fp16, int8)
+        
+    Returns:
+        list[float]: 丸め後のベクトル
+    """
+    if precision not in VECTOR_PRECISION_DECIMALS:
+        raise ValueError(f"Unsupported precision: {precision}")
+
+    decimals = VECTOR_PRECISION_DECIMALS[precision]
+    if decimals is None:
+        return vector
+
+    # float64 で丸めることで repr が最短表現 (例: 0.01235) になる
+    return np.round(np.asarray(vector, dtype=np.float64), decimals).tolist()
+
 
 class DistanceMetric(str, Enum):
     """距離メトリック"""
@@ -38,7 +75,7 @@ class VectorIndex:
     vector_count: int
 
 
-@dataclass
+@dataclass(slots=True)
 class VectorRecord:
     """ベクトルレコード"""
     key: str
@@ -47,7 +84,7 @@ class VectorRecord:
     data: Optional[bytes] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class QueryResult:
     """クエリ結果"""
     key: str
@@ -83,14 +120,15 @@ class S3VectorsGateway:
     MAX_DIMENSION = 8192
     MAX_METADATA_SIZE_BYTES = 40 * 1024  # 40KB
     MAX_QUERY_TOP_K = 10000
+    MAX_VECTORS_PER_PUT = 500  # PutVectors 1リクエストあたりの上限
 
     def __init__(
         self,
         region: str = "us-east-1",
     ):
         self.region = region
-        self._client = boto3.client("s3vectors", region_name=region)
-        self._s3_client = boto3.client("s3", region_name=region)
+        self._client = get_client("s3vectors", region)
+        self._s3_client = get_client("s3", region)
 
     async def create_index(
         self,
@@ -239,18 +277,31 @@ class S3VectorsGateway:
                     record["data"] = v.data
                 records.append(record)
 
-            response = self._client.put_vectors(
-                bucketName=bucket_name,
-                indexName=index_name,
-                vectors=records,
-            )
+            # 上限件数ごとにリクエストを分割し、並行して送信
+            batches = [
+                records[i:i + self.MAX_VECTORS_PER_PUT]
+                for i in range(0, len(records), self.MAX_VECTORS_PER_PUT)
+            ]
+            responses = await asyncio.gather(*(
+                asyncio.to_thread(
+                    self._client.put_vectors,
+                    bucketName=bucket_name,
+                    indexName=index_name,
+                    vectors=batch,
+                )
+                for batch in batches
+            ))
+
+            success_count = sum(r.get("successCount", 0) for r in responses)
+            error_count = sum(r.get("errorCount", 0) for r in responses)
+            errors = [e for r in responses for e in r.get("errors", [])]
 
-            log.info("vectors_put", success_count=response.get("successCount", 0))
+            log.info("vectors_put", success_count=success_count, batch_count=len(batches))
 
             return {
-                "success_count": response.get("successCount", 0),
-                "error_count": response.get("errorCount", 0),
-                "errors": response.get("errors", []),
+                "success_count": success_count,
+                "error_count": error_count,
+                "errors": errors,
             }
 
         except Exception as e:
@@ -342,7 +393,7 @@ class S3VectorsGateway:
         self,
         bucket_name: str,
         index_name: str,
-        query_vector: list[float],
+        query_vector: list[float] | np.ndarray,
         top_k: int = 10,
         filter_expression: Optional[dict[str, Any]] = None,
         include_metadata: bool = True,
@@ -372,7 +423,9 @@ class S3VectorsGateway:
             params = {
                 "bucketName": bucket_name,
                 "indexName": index_name,
-                "queryVector": query_vector,
+                "queryVector": (
+                    query_vector.tolist() if isinstance(query_vector, np.ndarray) else query_vector
+                ),
                 "topK": top_k,
                 "includeMetadata": include_metadata,
             }
@@ -407,7 +460,7 @@ class S3VectorsGateway:
         self,
         bucket_name: str,
         index_name: str,
-        query_vector: list[float],
+        query_vector: list[float] | np.ndarray,
         text_query: Optional[str] = None,
         top_k: int = 10,
         filter_expression: Optional[dict[str, Any]] = None,
@@ -441,32 +494,41 @@ class S3VectorsGateway:
         )
 
         # テキストクエリがある場合はメタデータでフィルタリング
-        if text_query:
+        candidates = vector_results.results
+        if text_query and candidates:
             text_lower = text_query.lower()
-            filtered_results = []
             
-            for r in vector_results.results:
-                # メタデータ内のテキストマッチングスコアを計算
-                text_score = 0.0
-                for key, value in r.metadata.items():
-                    if isinstance(value, str) and text_lower in value.lower():
-                        text_score = 1.0
-                        break
-                
-                # ハイブリッドスコア = vector_weight * vector_score + (1 - vector_weight) * text_score
-                hybrid_score = vector_weight * r.score + (1 - vector_weight) * text_score
-                
-                filtered_results.append(QueryResult(
-                    key=r.key,
-                    score=hybrid_score,
-                    metadata=r.metadata,
-                ))
+            # ベクトルスコアとテキストマッチスコア (メタデータに文字列が含まれれば 1.0) を配列化
+            vector_scores = np.fromiter(
+                (r.score for r in candidates), dtype=np.float64, count=len(candidates)
+            )
+            text_scores = np.fromiter(
+                (
+                    any(
+                        isinstance(value, str) and text_lower in value.lower()
+                        for value in r.metadata.values()
+                    )
+                    for r in candidates
+                ),
+                dtype=np.float64,
+                count=len(candidates),
+            )
             
-            # スコアでソート
-            filtered_results.sort(key=lambda x: x.score, reverse=True)
-            results = filtered_results[:top_k]
+            # ハイブリッドスコア = vector_weight * vector_score + (1 - vector_weight) * text_score
+            hybrid_scores = vector_weight * vector_scores + (1 - vector_weight) * text_scores
+            
+            # スコア降順の上位 top_k (同点は元の順序を維持)
+            order = np.argsort(-hybrid_scores, kind="stable")[:top_k]
+            results = [
+                QueryResult(
+                    key=candidates[i].key,
+                    score=float(hybrid_scores[i]),
+                    metadata=candidates[i].metadata,
+                )
+                for i in order.tolist()
+            ]
         else:
-            results = vector_results.results[:top_k]
+            results = candidates[:top_k]
 
         log.info("hybrid_search_completed", result_count=len(results))
 
@@ -2,4 +2,3 @@
 from .audio_repository import DynamoDBAudioRepository
 
 __all__ = ["DynamoDBAudioRepository"]
-
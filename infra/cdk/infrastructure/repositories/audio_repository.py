@@ -1,11 +1,16 @@
 """DynamoDB Audio Repository Implementation"""
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+from typing import Any
 from uuid import UUID
 
+import orjson
 import structlog
 
-from src.application.ports.repositories import IAudioRepository
+from src.application.ports.repositories import IAudioRepository, InvalidCursorError
 from src.domain.audio.entities import AudioFile
 from src.infrastructure.event_store import DynamoDBEventStore
 
@@ -80,36 +85,28 @@ class DynamoDBAudioRepository(IAudioRepository):
         ユーザーIDで音声ファイル一覧を取得
 
         注: Event Sourcing では一覧取得は Read Model から行うのが一般的。
-        ここでは簡易実装として、イベントから取得する。
+        ここでは簡易実装として、AudioCreated イベントの GSI2 (ユーザー別) から取得する。
         """
         log = logger.bind(user_id=str(user_id))
         log.info("finding_audio_by_user")
 
-        # AudioCreated イベントからユーザーの音声を検索
-        events = await self._event_store.get_events_by_type(
-            event_type="AudioCreated",
-            limit=limit * 2,  # フィルタリング用に多めに取得
+        # AudioCreated イベントを GSI2 (ユーザー別) から取得
+        events, last_key = await self._event_store.get_events_by_user(
+            user_id=user_id,
+            limit=limit,
+            exclusive_start_key=_decode_cursor(cursor, user_id),
         )
 
-        # ユーザーでフィルタリング
-        user_events = [
-            e
-            for e in events
-            if e["event_data"].get("user_id") == str(user_id)
-        ][:limit]
-
-        # 各音声の集約を再構築
-        audio_files = []
-        for event in user_events:
-            audio_id = UUID(event["event_data"]["audio_id"])
-            audio = await self.find_by_id(audio_id)
-            if audio:
-                audio_files.append(audio)
+        # 各音声の集約を並行して再構築
+        audios = await asyncio.gather(*(
+            self.find_by_id(UUID(event["event_data"]["audio_id"]))
+            for event in events
+        ))
+        audio_files = [audio for audio in audios if audio]
 
         log.info("audio_list_retrieved", count=len(audio_files))
 
-        # 簡易カーソル（最後のIDを返す）
-        next_cursor = str(audio_files[-1].id) if audio_files else None
+        next_cursor = _encode_cursor(last_key)
 
         return audio_files, next_cursor
 
@@ -135,3 +132,38 @@ class DynamoDBAudioRepository(IAudioRepository):
         log.info("audio_deleted")
         return True
 
+
+# GSI2 Query の LastEvaluatedKey を構成するキー (テーブルのキー + インデックスのキー)
+_CURSOR_KEYS = frozenset(("pk", "sk", "gsi2pk", "gsi2sk"))
+
+
+def _encode_cursor(last_key: dict[str, Any] | None) -> str | None:
+    """LastEvaluatedKey をページングカーソル文字列に変換"""
+    if not last_key:
+        return None
+    return base64.urlsafe_b64encode(orjson.dumps(last_key)).decode("ascii")
+
+
+def _decode_cursor(cursor: str | None, user_id: UUID) -> dict[str, Any] | None:
+    """
+    ページングカーソル文字列を ExclusiveStartKey に変換
+
+    カーソルはクライアントから渡されるため、復号できない値・GSI2 のキー構成と
+    一致しない値・他ユーザーのパーティションを指す値は
+    InvalidCursorError（400 応答）として扱う。
+    """
+    if not cursor:
+        return None
+    try:
+        last_key = orjson.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError) as e:
+        # orjson.JSONDecodeError / UnicodeDecodeError は ValueError のサブクラス
+        raise InvalidCursorError("Invalid pagination cursor") from e
+    if (
+        not isinstance(last_key, dict)
+        or last_key.keys() != _CURSOR_KEYS
+        or not all(isinstance(value, str) for value in last_key.values())
+        or last_key["gsi2pk"] != f"USER#{user_id}"
+    ):
+        raise InvalidCursorError("Invalid pagination cursor")
+    return last_key
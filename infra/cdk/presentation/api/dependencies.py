@@ -1,7 +1,7 @@
 """API Dependencies"""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 
 import structlog
 
@@ -28,7 +28,7 @@ class NoopEventPublisher(IEventPublisher):
             event_id=str(event.event_id),
         )
 
-    async def publish_batch(self, events: list["DomainEvent"]) -> None:
+    async def publish_batch(self, events: Sequence["DomainEvent"]) -> None:
         """イベントをバッチログ出力のみ"""
         for event in events:
             await self.publish(event)
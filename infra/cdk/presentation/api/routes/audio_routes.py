@@ -139,11 +139,10 @@ async def upload_audio(
         event_publisher=event_publisher,
     )
 
-    file_data = await file.read()
-
+    # 全体を読み込まず、スプールされたファイルオブジェクトをそのまま渡す
     input_data = UploadAudioInput(
         user_id=UUID(user_id),
-        file_data=file_data,
+        file_data=file.file,
         filename=file.filename or "audio.wav",
         content_type=file.content_type or "audio/wav",
         duration_seconds=duration_seconds,
@@ -5,6 +5,7 @@ import structlog
 from fastapi import Request
 from fastapi.responses import JSONResponse
 
+from src.application.ports.repositories import InvalidCursorError
 from src.application.use_cases.audio.get_audio import AudioNotFoundError
 from src.application.use_cases.audio.transcribe_audio import TranscriptionError
 from src.application.use_cases.audio.upload_audio import AudioUploadError
@@ -26,6 +27,19 @@ async def audio_not_found_handler(request: Request, exc: AudioNotFoundError) ->
     )
 
 
+async def invalid_cursor_handler(request: Request, exc: InvalidCursorError) -> JSONResponse:
+    """不正なページングカーソルのエラーハンドラ"""
+    logger.warning("invalid_cursor", error=str(exc))
+    return JSONResponse(
+        status_code=400,
+        content={
+            "error": "InvalidCursor",
+            "message": str(exc),
+            "code": "INVALID_CURSOR",
+        },
+    )
+
+
 async def transcription_error_handler(
     request: Request, exc: TranscriptionError
 ) -> JSONResponse:
@@ -85,6 +99,7 @@ async def generic_error_handler(request: Request, exc: Exception) -> JSONRespons
 # エラーハンドラのマッピング
 error_handlers = {
     AudioNotFoundError: audio_not_found_handler,
+    InvalidCursorError: invalid_cursor_handler,
     TranscriptionError: transcription_error_handler,
     AudioUploadError: upload_error_handler,
     ConcurrencyError: concurrency_error_handler,
@@ -92,6 +92,9 @@ class ComputeStack(NestedStack):
         # =================================================================
         # CopilotKit からの AG-UI プロトコルリクエストを処理
         # Lambda Function URL でレスポンスストリーミングを有効化
+        # (ハンドラはマネージド Python ランタイムで SSE 本文をバッファして返す。
+        #  フレームの逐次送出には Lambda Web Adapter (AWS_LWA_INVOKE_MODE=response_stream)
+        #  上の ASGI サーバで lambda_handler_streaming の generator を返す構成が必要)
 
         self.ag_ui_fn = lambda_.DockerImageFunction(
             self, 'AgUiFn',
@@ -64,6 +64,19 @@ class DataStack(NestedStack):
             ),
         )
 
+        # GSI for per-user listing (sparse: only events carrying user_id)
+        self.event_store_table.add_global_secondary_index(
+            index_name='gsi2',
+            partition_key=dynamodb.Attribute(
+                name='gsi2pk',
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name='gsi2sk',
+                type=dynamodb.AttributeType.STRING
+            ),
+        )
+
         # Read Model Table (CQRS)
         self.read_model_table = dynamodb.Table(
             self, 'ReadModel',
@@ -0,0 +1,94 @@
+"""Audio Domain Events Unit Tests"""
+import os
+
+import pytest
+
+from src.domain.audio.events import AudioCreated
+from src.domain.audio.events import audio_events
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    """テストごとに UUID プールを空にする"""
+    audio_events._reset_uuid_pool()
+    yield
+    audio_events._reset_uuid_pool()
+
+
+class TestUuidPool:
+    """プール済み乱数による UUID 生成のテスト"""
+
+    def test_uuid4_version_and_variant(self):
+        """正常: version 4 / RFC 4122 バリアントの UUID を生成する"""
+        value = audio_events._uuid4()
+
+        assert value.version == 4
+        assert value.variant == "specified in RFC 4122"
+
+    def test_uuid4_unique_across_pool_refill(self):
+        """正常: プールの補充をまたいでも重複しない"""
+        count = audio_events._UUID_POOL_SIZE * 2 + 1
+
+        values = {audio_events._uuid4() for _ in range(count)}
+
+        assert len(values) == count
+
+    def test_pool_refilled_in_batches(self, monkeypatch):
+        """正常: 乱数はプールサイズ分まとめて取得する"""
+        calls = []
+        real_urandom = os.urandom
+
+        def counting_urandom(n):
+            calls.append(n)
+            return real_urandom(n)
+
+        monkeypatch.setattr(audio_events.os, "urandom", counting_urandom)
+
+        for _ in range(audio_events._UUID_POOL_SIZE + 1):
+            audio_events._uuid4()
+
+        assert calls == [16 * audio_events._UUID_POOL_SIZE] * 2
+
+    def test_reset_discards_remaining_pool(self):
+        """正常: fork 後のリセットで残りの乱数を破棄する"""
+        audio_events._uuid4()
+        remaining = audio_events._uuid_pool[audio_events._uuid_offset:]
+
+        audio_events._reset_uuid_pool()
+        value = audio_events._uuid4()
+
+        assert value.bytes != remaining[:16]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="fork が利用できない環境")
+    def test_child_process_does_not_reuse_parent_pool(self):
+        """正常: fork した子プロセスは親と異なる UUID を生成する"""
+        audio_events._uuid4()  # 親でプールを確保
+        read_fd, write_fd = os.pipe()
+
+        pid = os.fork()
+        if pid == 0:  # 子プロセス
+            os.close(read_fd)
+            os.write(write_fd, audio_events._uuid4().bytes)
+            os._exit(0)
+
+        os.close(write_fd)
+        child_bytes = os.read(read_fd, 16)
+        os.close(read_fd)
+        os.waitpid(pid, 0)
+
+        assert child_bytes != audio_events._uuid4().bytes
+
+
+class TestDomainEvents:
+    """ドメインイベントのテスト"""
+
+    def test_event_ids_are_unique(self):
+        """正常: イベントごとに異なる event_id / audio_id を採番する"""
+        first, second = AudioCreated(), AudioCreated()
+
+        assert first.event_id != second.event_id
+        assert first.audio_id != second.audio_id
+
+    def test_event_type_is_class_name(self):
+        """正常: event_type はクラス名"""
+        assert AudioCreated().event_type == "AudioCreated"
@@ -15,9 +15,11 @@ from src.domain.audio.events import (
     AudioCreated,
     AudioProcessingStarted,
     TranscriptionCompleted,
+    SentimentAnalyzed,
     AudioProcessingCompleted,
     AudioProcessingFailed,
 )
+from src.domain.audio.events.audio_events import DomainEvent
 
 
 class TestAudioFileCreation:
@@ -267,6 +269,94 @@ class TestAudioFileEventSourcing:
         assert len(audio.get_uncommitted_events()) == 1
 
 
+class TestAudioFileEventDispatch:
+    """イベントディスパッチ・未コミットイベントのテスト"""
+
+    @pytest.fixture
+    def metadata(self) -> AudioMetadata:
+        return AudioMetadata(
+            duration_seconds=30.0,
+            sample_rate=16000,
+            channels=1,
+            format=AudioFormat.WAV,
+            file_size_bytes=2048,
+            bitrate=128,
+        )
+
+    def test_event_handlers_cover_all_events(self):
+        """正常: 全ドメインイベント型にハンドラが登録されている"""
+        assert set(AudioFile._EVENT_HANDLERS) == {
+            AudioCreated,
+            AudioProcessingStarted,
+            TranscriptionCompleted,
+            SentimentAnalyzed,
+            AudioProcessingCompleted,
+            AudioProcessingFailed,
+        }
+
+    def test_when_dispatches_by_event_type(self):
+        """正常: _when はイベント型に対応するハンドラで状態を遷移させる"""
+        # Arrange
+        audio = AudioFile(status=ProcessingStatus.PROCESSING)
+
+        # Act
+        audio._when(AudioProcessingFailed(audio_id=audio.id, reason="x", error_code="E"))
+
+        # Assert
+        assert audio.status == ProcessingStatus.FAILED
+
+    def test_when_ignores_unknown_event(self):
+        """正常: ハンドラ未登録のイベントは状態を変更しない"""
+        # Arrange
+        audio = AudioFile()
+
+        # Act
+        audio._when(DomainEvent())
+
+        # Assert
+        assert audio.status == ProcessingStatus.PENDING
+
+    def test_created_metadata_uses_trusted_path(self, metadata: AudioMetadata):
+        """正常: AudioCreated の適用で検証済みメタデータが同値で復元される"""
+        # Act
+        audio = AudioFile.create(user_id=uuid4(), s3_key="test.wav", metadata=metadata)
+
+        # Assert
+        assert audio.metadata == metadata
+        assert audio.metadata.format is AudioFormat.WAV
+        assert audio.metadata is not metadata
+
+    def test_uncommitted_events_is_tuple(self, metadata: AudioMetadata):
+        """正常: get_uncommitted_events は読み取り専用のタプルを返す"""
+        # Arrange
+        audio = AudioFile.create(user_id=uuid4(), s3_key="test.wav", metadata=metadata)
+
+        # Act
+        events = audio.get_uncommitted_events()
+        audio.start_processing()
+
+        # Assert: 取得済みのスナップショットは後続の操作で変化しない
+        assert isinstance(events, tuple)
+        assert [type(e) for e in events] == [AudioCreated]
+        assert [type(e) for e in audio.get_uncommitted_events()] == [
+            AudioCreated,
+            AudioProcessingStarted,
+        ]
+
+    def test_uncommitted_events_snapshot_survives_commit(self, metadata: AudioMetadata):
+        """正常: コミット後も取得済みのタプルは保持される"""
+        # Arrange
+        audio = AudioFile.create(user_id=uuid4(), s3_key="test.wav", metadata=metadata)
+        events = audio.get_uncommitted_events()
+
+        # Act
+        audio.mark_events_as_committed()
+
+        # Assert
+        assert len(events) == 1
+        assert audio.get_uncommitted_events() == ()
+
+
 class TestAudioMetadata:
     """AudioMetadata 値オブジェクトのテスト"""
 
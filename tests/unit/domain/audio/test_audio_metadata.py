@@ -0,0 +1,90 @@
+"""AudioMetadata Value Object Unit Tests"""
+import copy
+import dataclasses
+import pickle
+
+import pytest
+
+from src.domain.audio.value_objects.audio_metadata import AudioFormat, AudioMetadata
+
+
+def _metadata() -> AudioMetadata:
+    return AudioMetadata(
+        duration_seconds=30.0,
+        sample_rate=16000,
+        channels=1,
+        format=AudioFormat.WAV,
+        file_size_bytes=1024000,
+        bitrate=256,
+    )
+
+
+class TestAudioMetadataCopy:
+    """コピー・シリアライズのテスト"""
+
+    def test_deepcopy(self):
+        """正常: deepcopy できる"""
+        metadata = _metadata()
+
+        assert copy.deepcopy(metadata) == metadata
+
+    def test_pickle_round_trip(self):
+        """正常: pickle で往復できる"""
+        metadata = _metadata()
+
+        assert pickle.loads(pickle.dumps(metadata)) == metadata
+
+    def test_asdict_contains_only_fields(self):
+        """正常: asdict は公開フィールドのみを返す"""
+        assert dataclasses.asdict(_metadata()) == {
+            "duration_seconds": 30.0,
+            "sample_rate": 16000,
+            "channels": 1,
+            "format": AudioFormat.WAV,
+            "file_size_bytes": 1024000,
+            "bitrate": 256,
+        }
+
+
+class TestAudioMetadataDict:
+    """辞書変換のテスト"""
+
+    def test_to_dict_returns_independent_copy(self):
+        """正常: to_dict の戻り値を変更しても元の値に影響しない"""
+        metadata = _metadata()
+
+        data = metadata.to_dict()
+        data["sample_rate"] = 44100
+
+        assert metadata.to_dict()["sample_rate"] == 16000
+
+    def test_from_dict_round_trip(self):
+        """正常: to_dict / from_dict で往復できる"""
+        metadata = _metadata()
+
+        assert AudioMetadata.from_dict(metadata.to_dict()) == metadata
+
+    def test_from_dict_trusted_round_trip(self):
+        """正常: from_dict_trusted でも同じ値が復元される"""
+        metadata = _metadata()
+
+        restored = AudioMetadata.from_dict_trusted(metadata.to_dict())
+
+        assert restored == metadata
+        assert restored.format is AudioFormat.WAV
+        assert restored.to_dict() == metadata.to_dict()
+
+    def test_from_dict_trusted_result_is_frozen(self):
+        """正常: from_dict_trusted の結果も不変"""
+        restored = AudioMetadata.from_dict_trusted(_metadata().to_dict())
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            restored.channels = 2
+
+    def test_from_dict_validates(self):
+        """異常: from_dict は不正な値を拒否する"""
+        data = _metadata().to_dict()
+        data["sample_rate"] = 12345
+
+        with pytest.raises(ValueError):
+            AudioMetadata.from_dict(data)
@@ -0,0 +1,64 @@
+"""TranscriptSegment Value Object Unit Tests"""
+import dataclasses
+
+import pytest
+
+from src.domain.audio.value_objects.transcript_segment import TranscriptSegment
+
+
+def _segment(text: str = "hello  nova world") -> TranscriptSegment:
+    return TranscriptSegment(
+        start_time=1.0,
+        end_time=2.5,
+        text=text,
+        confidence=0.9,
+        speaker_id="spk_0",
+    )
+
+
+class TestTranscriptSegmentImmutability:
+    """不変性のテスト"""
+
+    def test_word_count(self):
+        """正常: 連続する空白を含む text の単語数"""
+        assert _segment().word_count == 3
+
+    def test_cannot_reassign_field(self):
+        """異常: 生成後にフィールドを書き換えられない"""
+        segment = _segment()
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            segment.text = "changed"
+
+        assert segment.word_count == 3
+
+    def test_replace_recomputes_word_count(self):
+        """正常: replace で生成した新しいセグメントは単語数を再計算する"""
+        segment = dataclasses.replace(_segment(), text="one")
+
+        assert segment.word_count == 1
+
+    def test_equal_segments_have_equal_hash(self):
+        """正常: 等価なセグメントは同じハッシュ値を持つ"""
+        assert _segment() == _segment()
+        assert hash(_segment()) == hash(_segment())
+
+    def test_invalid_time_range(self):
+        """異常: end_time が start_time 以下"""
+        with pytest.raises(ValueError):
+            TranscriptSegment(start_time=2.0, end_time=2.0, text="x", confidence=0.5)
+
+
+class TestTranscriptSegmentSlots:
+    """slots のテスト"""
+
+    def test_has_no_instance_dict(self):
+        """正常: slots によりインスタンス辞書を持たない"""
+        assert not hasattr(_segment(), "__dict__")
+
+    def test_cannot_add_attribute(self):
+        """異常: 未定義の属性は追加できない"""
+        segment = _segment()
+
+        with pytest.raises((AttributeError, TypeError)):
+            segment.extra = 1